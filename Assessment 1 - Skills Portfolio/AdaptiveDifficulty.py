@@ -0,0 +1,84 @@
+#Adaptive difficulty for MathQuiz.
+#Keeps an exponentially weighted estimate of the player's accuracy and response time for
+#each operation and moves between operand ranges ("tiers") to keep accuracy near a target.
+#Problems come from a pool generated up front, so picking one is O(1).
+import random
+
+#Operand ranges from easiest to hardest (the fixed menu levels are tiers 0, 3 and 6)
+TIERS = [(1, 9), (2, 20), (10, 50), (10, 99), (50, 500), (100, 999), (1000, 9999)]
+POOL_SIZE = 256 #Pre-generated problems per (tier, operation)
+
+ALPHA = 0.3 #Weight of the newest answer in the running averages
+TARGET_ACCURACY = 0.75
+RAISE_ACCURACY = 0.85 #Move up a tier above this accuracy ...
+FAST_SECONDS = 8.0 #... when answers also come faster than this
+LOWER_ACCURACY = 0.6 #Move down a tier below this accuracy ...
+SLOW_SECONDS = 15.0 #... or when answers take longer than this
+MIN_ANSWERS_PER_TIER = 3 #Answers needed at a tier before it can change again
+
+
+def build_pool(tier, op, size=POOL_SIZE, rng=random):
+    lo, hi = TIERS[tier]
+    pool = []
+    for _ in range(size):
+        n1, n2 = rng.randint(lo, hi), rng.randint(lo, hi)
+        if op == '-' and n2 > n1: n1, n2 = n2, n1 #Keep answers non-negative for the keypad
+        pool.append((n1, n2))
+    return pool
+
+
+class OperationStats:
+    """Running (EWMA) accuracy and latency for one operation, plus its current tier."""
+    __slots__ = ("accuracy", "seconds", "tier", "answered")
+
+    def __init__(self, tier):
+        self.accuracy = TARGET_ACCURACY
+        self.seconds = (FAST_SECONDS + SLOW_SECONDS) / 2
+        self.tier = tier
+        self.answered = 0 #Answers since the last tier change
+
+
+class AdaptiveEngine:
+    """Picks the next problem from the player's running performance statistics."""
+    def __init__(self, operations=('+', '-'), start_tier=1, rng=random):
+        self.rng = rng
+        self.operations = tuple(operations)
+        self.stats = {op: OperationStats(start_tier) for op in self.operations}
+        self.pools = {(tier, op): build_pool(tier, op, rng=rng)
+                      for tier in range(len(TIERS)) for op in self.operations}
+
+    def next_problem(self, op=None):
+        """Returns (n1, n2, op) drawn from the pool of the operation's current tier."""
+        if op is None: op = self.rng.choice(self.operations)
+        pool = self.pools[(self.stats[op].tier, op)]
+        n1, n2 = pool[self.rng.randrange(len(pool))]
+        return n1, n2, op
+
+    def update(self, op, correct, attempts, seconds):
+        """Feeds one answered question back into the statistics and adjusts the tier."""
+        stats = self.stats.get(op)
+        if stats is None: return
+        #First-try answers count fully, second-try answers half (same as the 10/5 scoring)
+        score = (1.0 if attempts <= 1 else 0.5) if correct else 0.0
+        stats.accuracy += ALPHA * (score - stats.accuracy)
+        stats.seconds += ALPHA * (seconds - stats.seconds)
+        stats.answered += 1
+        if stats.answered < MIN_ANSWERS_PER_TIER: return
+
+        if stats.accuracy > RAISE_ACCURACY and stats.seconds < FAST_SECONDS and stats.tier < len(TIERS) - 1:
+            stats.tier += 1
+            self._recentre(stats)
+        elif (stats.accuracy < LOWER_ACCURACY or stats.seconds > SLOW_SECONDS) and stats.tier > 0:
+            stats.tier -= 1
+            self._recentre(stats)
+
+    def _recentre(self, stats):
+        stats.answered = 0
+        #After a tier change start the estimate halfway back to the target, so one lucky
+        #or unlucky answer does not immediately move the player again
+        stats.accuracy = (stats.accuracy + TARGET_ACCURACY) / 2
+        stats.seconds = (stats.seconds + (FAST_SECONDS + SLOW_SECONDS) / 2) / 2
+
+    def describe(self):
+        """Short text for the quiz status bar, e.g. '+ 10-99 | - 2-20'."""
+        return " | ".join(f"{op} {TIERS[s.tier][0]}-{TIERS[s.tier][1]}" for op, s in self.stats.items())
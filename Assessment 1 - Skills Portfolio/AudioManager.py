@@ -0,0 +1,226 @@
+#Shared audio manager for the Skills Portfolio apps.
+#pygame is imported and the mixer started on a background thread, sounds are decoded
+#lazily there too (a play() made before its sound is ready starts once it is decoded), and
+#decoded PCM is cached on disk so later launches skip MP3 decoding.
+#Without pygame or an audio device every call is a silent no-op.
+import os
+import threading
+import time
+
+AUDIO_CACHE_DIR = ".audio_cache"
+NUM_CHANNELS = 8 #Size of the shared channel pool
+
+#Sound priorities: a new sound may only steal a voice of equal or lower priority
+PRIORITY_LOW = 1 #UI clicks
+PRIORITY_NORMAL = 2
+PRIORITY_HIGH = 3 #Feedback that must be heard (correct/wrong)
+
+
+class ChannelPool:
+    """Fixed set of mixer channels handed out by priority, stealing the least important voice when full."""
+    def __init__(self, mixer, size=NUM_CHANNELS):
+        mixer.set_num_channels(size)
+        self.channels = [mixer.Channel(i) for i in range(size)]
+        self.owners = [None] * size #(sound name, priority, start time) per channel
+
+    def play(self, name, sound, priority, loops=0):
+        free = victim = None
+        victim_key = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                free = i
+                break
+            owner = self.owners[i] or (None, 0, 0.0)
+            #Steal the lowest priority voice first, and the oldest among equals
+            if owner[1] <= priority and (victim_key is None or owner[1:] < victim_key):
+                victim, victim_key = i, owner[1:]
+        slot = free if free is not None else victim
+        if slot is None:
+            return None #Every channel is playing something more important
+        channel = self.channels[slot]
+        channel.play(sound, loops=loops)
+        self.owners[slot] = (name, priority, time.monotonic())
+        return channel
+
+    def stop(self, name):
+        for i, owner in enumerate(self.owners):
+            if owner and owner[0] == name:
+                self.channels[i].stop()
+                self.owners[i] = None
+
+
+class AudioManager:
+    """Lazily started mixer plus a name -> Sound registry."""
+    def __init__(self, frequency=44100, size=-16, channels=2, buffer=512, use_disk_cache=True):
+        self.mixer_args = (frequency, size, channels, buffer)
+        self.use_disk_cache = use_disk_cache
+        self.pygame = None #Set once the deferred import succeeds
+        self.available = False
+        self.error = None
+        self.registered = {} #name -> (path, volume)
+        self.settings = {} #name -> (priority, coalesce window in seconds)
+        self.last_played = {} #name -> time of the last accepted play, for coalescing
+        self.pool = None
+        self.sounds = {} #name -> decoded pygame Sound
+        self.pending = set() #names currently being decoded
+        self.failed = set() #names that could not be decoded (not retried)
+        self.deferred = {} #name -> loops of a play() made while the sound was still decoding
+        self.music = None #(path, volume, loops) to start once the mixer is ready
+        self.lock = threading.Lock()
+        self.pool_lock = threading.Lock() #Channel pool is used from the UI and decoder threads
+        self.ready = threading.Event()
+        self.thread = None
+
+    def register(self, name, path, volume=1.0, priority=PRIORITY_NORMAL, coalesce_ms=0):
+        """Registers a sound. Plays of the same sound within coalesce_ms are merged into one."""
+        with self.lock:
+            self.registered[name] = (path, volume)
+            self.settings[name] = (priority, coalesce_ms / 1000)
+        return self
+
+    def set_music(self, path, volume=0.5, loops=-1):
+        self.music = (path, volume, loops)
+        return self
+
+    def start(self):
+        """Starts the mixer and decodes the registered sounds without blocking the caller."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._load, daemon=True)
+            self.thread.start()
+        return self
+
+    def _load(self):
+        try:
+            import pygame
+            pygame.mixer.init(*self.mixer_args)
+            self.pool = ChannelPool(pygame.mixer)
+            self.pygame = pygame
+            self.available = True
+        except Exception as e: #ImportError, or pygame.error when there is no audio device
+            self.error = e
+            print(f"Audio disabled: {e}")
+            with self.lock:
+                self.deferred.clear()
+            self.ready.set()
+            return
+
+        if self.music:
+            self._start_music()
+        self.ready.set()
+
+        with self.lock:
+            names = [n for n in self.registered if n not in self.sounds and n not in self.pending]
+            self.pending.update(names)
+        for name in names:
+            self._decode(name)
+
+    def _start_music(self):
+        path, volume, loops = self.music
+        try:
+            self.pygame.mixer.music.load(path)
+            self.pygame.mixer.music.set_volume(volume)
+            self.pygame.mixer.music.play(loops)
+        except self.pygame.error as e:
+            print(f"Could not play music '{path}': {e}")
+
+    def _cache_path(self, path):
+        frequency, size, channels = self.pygame.mixer.get_init()
+        name = os.path.splitext(os.path.basename(path))[0]
+        mtime = os.stat(path).st_mtime_ns
+        return os.path.join(AUDIO_CACHE_DIR, f"{name}_{mtime}_{frequency}_{size}_{channels}.pcm")
+
+    def _decode(self, name):
+        path, volume = self.registered[name]
+        Sound = self.pygame.mixer.Sound
+        try:
+            cache = self._cache_path(path) if self.use_disk_cache else None
+            if cache and os.path.exists(cache):
+                with open(cache, 'rb') as f:
+                    sound = Sound(buffer=f.read())
+            else:
+                sound = Sound(path)
+                if cache:
+                    self._write_cache(cache, sound.get_raw())
+            sound.set_volume(volume)
+        except (OSError, self.pygame.error) as e:
+            print(f"Could not load sound '{path}': {e}")
+            with self.lock:
+                self.failed.add(name)
+                self.pending.discard(name)
+                self.deferred.pop(name, None)
+            return
+        with self.lock:
+            self.sounds[name] = sound
+            self.pending.discard(name)
+            loops = self.deferred.pop(name, None)
+        if loops is not None:
+            self._start(name, sound, loops) #Replay the request made while decoding
+
+    def _request(self, name):
+        #Sound registered after the loader finished: decode it on demand, off the UI thread
+        with self.lock:
+            if name not in self.registered or name in self.pending or name in self.failed: return
+            self.pending.add(name)
+        threading.Thread(target=self._decode, args=(name,), daemon=True).start()
+
+    def _write_cache(self, cache, raw):
+        try:
+            os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+            with open(cache, 'wb') as f:
+                f.write(raw)
+        except OSError:
+            pass #The cache only speeds up the next launch
+
+    def get(self, name):
+        """Returns the decoded Sound, or None while it is still loading or unavailable."""
+        return self.sounds.get(name)
+
+    def play(self, name, loops=0):
+        """Plays a registered sound on a pooled channel. Returns the channel, or None when nothing
+        played yet: a sound still decoding is played (with its loops) as soon as it is ready."""
+        with self.lock:
+            sound = self.sounds.get(name)
+            if sound is None:
+                if self.error is not None or name not in self.registered or name in self.failed:
+                    return None
+                self.deferred[name] = loops #Checked under the lock, so _decode cannot miss it
+        if sound is None:
+            if self.available and not self.thread.is_alive():
+                self._request(name)
+            return None
+        return self._start(name, sound, loops)
+
+    def _start(self, name, sound, loops):
+        priority, window = self.settings[name]
+        with self.pool_lock:
+            if not self.available:
+                return None #Shut down while the sound was decoding
+            now = time.monotonic()
+            if window and now - self.last_played.get(name, -window) < window:
+                return None #Part of a burst that is already playing
+            self.last_played[name] = now
+            return self.pool.play(name, sound, priority, loops)
+
+    def stop(self, name):
+        """Stops every channel currently playing the named sound, and drops a deferred play of it."""
+        with self.lock:
+            self.deferred.pop(name, None)
+        if self.pool is not None:
+            with self.pool_lock:
+                self.pool.stop(name)
+
+    def stop_music(self):
+        if self.available and self.pygame.mixer.get_init():
+            self.pygame.mixer.music.stop()
+
+    def shutdown(self):
+        """Stops music and closes the mixer (waits briefly for a still-running loader)."""
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        if self.available and self.pygame.mixer.get_init():
+            self.pygame.mixer.music.stop()
+            self.pygame.mixer.quit()
+        self.available = False
+        with self.lock:
+            self.sounds = {}
+            self.deferred.clear()
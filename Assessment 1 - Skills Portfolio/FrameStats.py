@@ -0,0 +1,132 @@
+#Opt-in frame-time instrumentation for FrameClock (MathQuiz and RandomJokes).
+#Records, per frame: update cost, scheduling jitter against the requested interval,
+#dropped frames, Tcl calls made by the sprite groups and process CPU time.
+#Enable with the FRAME_STATS environment variable:
+#   FRAME_STATS=1 python MathQuiz.py               (overlay only)
+#   FRAME_STATS=trace.csv python RandomJokes.py    (overlay, trace written on close)
+#   FRAME_STATS=trace.json ...                     (JSON trace with a summary)
+import csv
+import json
+import os
+import time
+from array import array
+
+MAX_FRAMES = 100_000 #Frames kept for the trace (about 80 minutes at 20 fps)
+OVERLAY_EVERY = 10 #Frames between overlay refreshes
+OVERLAY_TAG = "frame_stats"
+COLUMNS = ("t_ms", "update_ms", "jitter_ms", "dropped", "tcl_calls", "cpu_ms")
+
+
+class CallCounter:
+    """Stands in for a canvas and counts every method call made through it."""
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if not callable(attr): return attr
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class FrameStats:
+    def __init__(self, interval, output=None):
+        self.interval = interval
+        self.output = output #.csv or .json path written by export(), or None
+        self.counters = []
+        self.origin = time.perf_counter()
+        self.scheduled_at = None
+        self.tick_start = self.cpu_start = self.late = 0.0
+        self.overlays = {} #canvas -> overlay text item
+        self.columns = {name: array('d') for name in COLUMNS}
+
+    @classmethod
+    def from_environment(cls, interval):
+        """Returns a FrameStats when FRAME_STATS is set, otherwise None (no overhead)."""
+        value = os.environ.get("FRAME_STATS", "").strip()
+        if not value or value == "0": return None
+        return cls(interval, None if value == "1" else value)
+
+    def attach(self, group):
+        """Routes the group's canvas calls through a counter."""
+        if not isinstance(group.canvas, CallCounter):
+            group.canvas = CallCounter(group.canvas)
+            self.counters.append(group.canvas)
+
+    def scheduled(self):
+        self.scheduled_at = time.perf_counter()
+
+    def frame_start(self):
+        for counter in self.counters: counter.calls = 0
+        self.tick_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        #How far past its due time this tick ran
+        due = self.scheduled_at + self.interval / 1000 if self.scheduled_at else self.tick_start
+        self.late = self.tick_start - due
+
+    def frame_end(self, canvas):
+        end = time.perf_counter()
+        interval_s = self.interval / 1000
+        late = self.late
+        columns = self.columns
+        if len(columns["t_ms"]) < MAX_FRAMES:
+            columns["t_ms"].append((self.tick_start - self.origin) * 1000)
+            columns["update_ms"].append((end - self.tick_start) * 1000)
+            columns["jitter_ms"].append(late * 1000)
+            columns["dropped"].append(max(0, int(late // interval_s)))
+            columns["tcl_calls"].append(sum(counter.calls for counter in self.counters))
+            columns["cpu_ms"].append((time.process_time() - self.cpu_start) * 1000)
+        if canvas is not None and len(columns["t_ms"]) % OVERLAY_EVERY == 0:
+            self.draw_overlay(getattr(canvas, "_canvas", canvas))
+
+    def summary(self, last=None):
+        """Averages over the last 'last' frames (all frames when None)."""
+        c = {name: column[-last:] if last else column for name, column in self.columns.items()}
+        n = len(c["t_ms"])
+        if n == 0: return {"frames": 0}
+        span = (c["t_ms"][-1] - c["t_ms"][0]) / 1000
+        update = sorted(c["update_ms"])
+        return {
+            "frames": n,
+            "fps": (n - 1) / span if span > 0 else 0.0,
+            "update_ms_mean": sum(update) / n,
+            "update_ms_p95": update[min(n - 1, int(0.95 * n))],
+            "jitter_ms_mean": sum(c["jitter_ms"]) / n,
+            "jitter_ms_max": max(c["jitter_ms"]),
+            "dropped": int(sum(c["dropped"])),
+            "tcl_calls_per_frame": sum(c["tcl_calls"]) / n,
+            "cpu_percent": 100 * sum(c["cpu_ms"]) / 1000 / span if span > 0 else 0.0,
+        }
+
+    def draw_overlay(self, canvas):
+        s = self.summary(last=OVERLAY_EVERY * 5)
+        text = (f"{s['fps']:.1f} fps  update {s['update_ms_mean']:.2f} ms (p95 {s['update_ms_p95']:.2f})\n"
+                f"jitter {s['jitter_ms_mean']:.1f} ms  dropped {int(sum(self.columns['dropped']))}  "
+                f"tcl {s['tcl_calls_per_frame']:.0f}/frame  cpu {s['cpu_percent']:.1f}%")
+        try:
+            item = self.overlays.get(canvas)
+            if item is None:
+                item = self.overlays[canvas] = canvas.create_text(6, 6, anchor="nw", tags=OVERLAY_TAG,
+                                                                  font=("Courier", 9), fill="#FF00FF")
+            canvas.itemconfigure(item, text=text)
+            canvas.tag_raise(item)
+        except Exception:
+            pass #Canvas may be gone during close
+
+    def export(self, path=None):
+        """Writes the per-frame trace as CSV, or as JSON (summary plus columns) for .json paths."""
+        path = path or self.output
+        if not path: return None
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"interval_ms": self.interval, "summary": self.summary(),
+                           "frames": {name: list(column) for name, column in self.columns.items()}}, f)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS)
+                writer.writerows(zip(*(self.columns[name] for name in COLUMNS)))
+        return path
@@ -0,0 +1,158 @@
+#Grading schemes (grade boundaries plus the weight of coursework) and instant cohort re-grading.
+#A student's percentage depends only on (coursework, exam), so the cohort is reduced once to a
+#histogram over those pairs. Re-grading under any scheme then walks the histogram instead of
+#the students: 161 overall totals when coursework keeps its standard 60/160 weight, at most
+#61 x 101 (coursework, exam) cells when the weights change, whatever the cohort size.
+#Named schemes are kept in grading_schemes.json next to the marks file.
+#Usage: python GradingSchemes.py benchmark [rows]
+import json
+import sys
+import time
+from collections import Counter
+from StudentRepository import GRADE_BOUNDARIES
+
+SCHEMES_FILE = "grading_schemes.json"
+STANDARD_COURSEWORK_WEIGHT = 37.5 #60 of the 160 marks
+
+
+class GradingScheme:
+    """Grade boundaries (minimum percentage per grade) and the coursework share of the percentage."""
+    def __init__(self, name="Standard", boundaries=GRADE_BOUNDARIES, coursework_weight=STANDARD_COURSEWORK_WEIGHT):
+        self.name = name
+        #Best grade first; the last grade catches everything below the others
+        self.boundaries = tuple(sorted(((grade, minimum) for grade, minimum in boundaries), key=lambda b: -b[1]))
+        self.coursework_weight = coursework_weight
+
+    def percentage(self, coursework, exam):
+        """Weighted percentage; with the standard weight this equals total * 100 / 160 exactly."""
+        w = self.coursework_weight
+        return (w * coursework * 5 + (100 - w) * exam * 3) / 300
+
+    def grade(self, percent):
+        for grade, minimum in self.boundaries:
+            if percent >= minimum:
+                return grade
+        return self.boundaries[-1][0]
+
+    def grade_student(self, student):
+        return self.grade(self.percentage(student.get_coursework_total(), student.exam_mark))
+
+    def uses_total_only(self):
+        """True when the percentage depends on the overall total alone (standard weighting)."""
+        return self.coursework_weight == STANDARD_COURSEWORK_WEIGHT
+
+    def with_changes(self, name=None, boundaries=None, coursework_weight=None):
+        return GradingScheme(name or self.name, boundaries or self.boundaries,
+                             self.coursework_weight if coursework_weight is None else coursework_weight)
+
+    def describe(self):
+        bounds = "/".join(f"{minimum:g}" for _, minimum in self.boundaries[:-1])
+        return f"{self.name}: {bounds}, coursework {self.coursework_weight:g}% / exam {100 - self.coursework_weight:g}%"
+
+    def to_dict(self):
+        return {"name": self.name, "boundaries": [list(b) for b in self.boundaries],
+                "coursework_weight": self.coursework_weight}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], [tuple(b) for b in data["boundaries"]],
+                   data.get("coursework_weight", STANDARD_COURSEWORK_WEIGHT))
+
+
+STANDARD = GradingScheme()
+PRESETS = [
+    STANDARD,
+    GradingScheme("Strict", (('A', 80), ('B', 70), ('C', 60), ('D', 50), ('F', 0))),
+    GradingScheme("Exam Weighted", GRADE_BOUNDARIES, 25),
+]
+
+
+def load_schemes(path=SCHEMES_FILE):
+    """Presets followed by the schemes saved in 'path' (a saved scheme replaces a preset of that name)."""
+    schemes = {scheme.name: scheme for scheme in PRESETS}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for data in json.load(f):
+                scheme = GradingScheme.from_dict(data)
+                schemes[scheme.name] = scheme
+    except FileNotFoundError:
+        pass
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring '{path}': {e}")
+    return list(schemes.values())
+
+
+def save_scheme(scheme, path=SCHEMES_FILE):
+    """Adds or replaces one named scheme in the schemes file."""
+    saved = [s for s in load_schemes(path) if s not in PRESETS and s.name != scheme.name]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([s.to_dict() for s in saved + [scheme]], f, indent=2)
+
+
+class CohortHistogram:
+    """Number of students per (coursework, exam) pair, kept up to date on edits."""
+    def __init__(self, coursework=(), exam=()):
+        self.cells = Counter(zip(coursework, exam))
+        self.totals = Counter()
+        for (cw, ex), count in self.cells.items():
+            self.totals[cw + ex] += count
+
+    @classmethod
+    def from_columns(cls, course1, course2, course3, exam):
+        return cls(map(lambda a, b, c: a + b + c, course1, course2, course3), exam)
+
+    def add(self, coursework, exam, count=1):
+        self.cells[(coursework, exam)] += count
+        self.totals[coursework + exam] += count
+        for counter, key in ((self.cells, (coursework, exam)), (self.totals, coursework + exam)):
+            if counter[key] == 0: del counter[key]
+
+    def remove(self, coursework, exam):
+        self.add(coursework, exam, -1)
+
+    def __len__(self):
+        return sum(self.totals.values())
+
+    def _groups(self, *schemes):
+        #(coursework, exam, count) groups that share a percentage under every scheme given;
+        #with standard weighting the total decides, and (total, 0) has the same percentage
+        if all(scheme.uses_total_only() for scheme in schemes):
+            return ((total, 0, count) for total, count in self.totals.items())
+        return ((cw, ex, count) for (cw, ex), count in self.cells.items())
+
+    def regrade(self, scheme):
+        """Grade -> number of students under 'scheme' (every grade present, best first)."""
+        counts = dict.fromkeys((grade for grade, _ in scheme.boundaries), 0)
+        for cw, ex, count in self._groups(scheme):
+            counts[scheme.grade(scheme.percentage(cw, ex))] += count
+        return counts
+
+    def changed(self, scheme, baseline=STANDARD):
+        """Number of students whose grade under 'scheme' differs from 'baseline'."""
+        return sum(count for cw, ex, count in self._groups(scheme, baseline)
+                   if scheme.grade(scheme.percentage(cw, ex)) != baseline.grade(baseline.percentage(cw, ex)))
+
+
+def benchmark(rows=1_000_000):
+    import random
+    from StudentRepository import Student
+    rng = random.Random(5)
+    students = [Student(i, "x", rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 100))
+                for i in range(rows)]
+    start = time.perf_counter()
+    histogram = CohortHistogram((s.get_coursework_total() for s in students), (s.exam_mark for s in students))
+    print(f"{rows} students, histogram built in {time.perf_counter() - start:.2f} s "
+          f"({len(histogram.totals)} totals, {len(histogram.cells)} cells)")
+    for scheme in PRESETS:
+        start = time.perf_counter(); counts = histogram.regrade(scheme); fast = time.perf_counter() - start
+        start = time.perf_counter(); direct = Counter(scheme.grade_student(s) for s in students)
+        slow = time.perf_counter() - start
+        same = all(counts[g] == direct[g] for g in counts)
+        print(f"{scheme.name:>14}: histogram {fast * 1e6:8.0f} us  per student {slow * 1000:7.0f} ms  "
+              f"{'identical' if same else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["benchmark"]:
+        print("Usage: python GradingSchemes.py benchmark [rows]"); sys.exit(1)
+    benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
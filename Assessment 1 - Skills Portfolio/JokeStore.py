@@ -0,0 +1,180 @@
+#Indexed, lazily loaded joke store for RandomJokes.
+#Only the byte offset of each joke is kept in memory (and cached on disk next to
+#the jokes file); jokes are read on demand by seeking to their offset.
+#When the file changes, only the region after the first changed block is re-indexed.
+import os
+import random
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"JOKEIDX2"
+_HEADER = struct.Struct("<8sqqq") #magic, file size, file mtime (ns), number of offsets
+BLOCK_SIZE = 64 * 1024 #Granularity used to find the changed region of the file
+
+
+def parse_joke(line):
+    """Splits a raw joke line into (setup, punchline), or returns None if it is not a joke."""
+    line = line.strip()
+    if not line: return None
+    parts = line.split('?', 1)
+    if len(parts) != 2: return None
+    return parts[0].strip(), parts[1].strip()
+
+
+def scan_offsets(f, start=0):
+    """Yields the byte offset of every joke line in binary file 'f' from 'start' onwards."""
+    f.seek(start)
+    offset = start
+    for line in f:
+        if b'?' in line and line.strip():
+            yield offset
+        offset += len(line)
+
+
+def block_checksums(f):
+    """Returns the CRC32 of every BLOCK_SIZE block of binary file 'f'."""
+    f.seek(0)
+    crcs = array('L')
+    while True:
+        block = f.read(BLOCK_SIZE)
+        if not block: break
+        crcs.append(zlib.crc32(block))
+    return crcs
+
+
+class IndexUpdate:
+    """Result of re-indexing a changed jokes file, computed off the UI thread."""
+    def __init__(self, stat, offsets, crcs, first_changed, old_count):
+        self.stat = stat
+        self.offsets = offsets
+        self.crcs = crcs
+        self.first_changed = first_changed #Index of the first joke that was re-parsed
+        self.old_count = old_count
+        self.seconds = 0.0 #Filled in by the caller with the wall-clock reload time
+
+    def added(self):
+        return len(self.offsets) - self.old_count
+
+
+class JokeStore:
+    """Random access to the jokes in a text file with a no-repeat shuffled order."""
+    def __init__(self, file_path, use_index_file=True):
+        self.file_path = file_path
+        self.index_path = file_path + INDEX_SUFFIX if use_index_file else None
+        self.offsets = array('q')
+        self.crcs = array('L')
+        self.stat = None
+        self.order = array('l')
+        self.cursor = 0
+        self.last_served = None
+        self.load()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def load(self):
+        """Loads the offset index, rebuilding it when the jokes file has changed."""
+        stat = os.stat(self.file_path)
+        if not self._read_index(stat):
+            with open(self.file_path, 'rb') as f:
+                self.offsets = array('q', scan_offsets(f))
+                self.crcs = block_checksums(f)
+            self._write_index(stat, self.offsets, self.crcs)
+        self.stat = stat
+        self.reset_order()
+
+    def has_changed(self):
+        """Cheap mtime/size check used by the file watcher."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) != (self.stat.st_size, self.stat.st_mtime_ns)
+
+    def compute_update(self):
+        """Re-indexes only the part of the file after the first changed block.
+
+        Safe to call from a worker thread: it only reads the current index.
+        Returns an IndexUpdate to pass to apply_update() on the UI thread.
+        """
+        stat = os.stat(self.file_path)
+        with open(self.file_path, 'rb') as f:
+            crcs = block_checksums(f)
+            first_block = 0
+            limit = min(len(crcs), len(self.crcs))
+            while first_block < limit and crcs[first_block] == self.crcs[first_block]:
+                first_block += 1
+            #Restart from the last joke that starts before the changed block (always a line start)
+            keep = bisect_left(self.offsets, first_block * BLOCK_SIZE) - 1
+            if keep < 0:
+                keep, restart = 0, 0
+            else:
+                restart = self.offsets[keep]
+            offsets = self.offsets[:keep]
+            offsets.extend(scan_offsets(f, restart))
+        self._write_index(stat, offsets, crcs)
+        return IndexUpdate(stat, offsets, crcs, keep, len(self.offsets))
+
+    def apply_update(self, update):
+        """Swaps in a computed update and merges new jokes into the shuffled order."""
+        self.offsets, self.crcs, self.stat = update.offsets, update.crcs, update.stat
+        if update.added() >= 0:
+            #Every old index is still valid: new jokes join the unserved tail of this round
+            self.order.extend(range(update.old_count, len(self.offsets)))
+        else:
+            self.reset_order()
+
+    def _read_index(self, stat):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, size, mtime, count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != INDEX_MAGIC or size != stat.st_size or mtime != stat.st_mtime_ns:
+                    return False
+                offsets = array('q')
+                offsets.fromfile(f, count)
+                crcs = array('L')
+                crcs.frombytes(f.read())
+        except (OSError, EOFError, struct.error, ValueError):
+            return False
+        self.offsets, self.crcs = offsets, crcs
+        return True
+
+    def _write_index(self, stat, offsets, crcs):
+        if not self.index_path: return
+        try:
+            with open(self.index_path, 'wb') as f:
+                f.write(_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets)))
+                offsets.tofile(f)
+                crcs.tofile(f)
+        except OSError:
+            pass #The index is only a cache; the store still works without it
+
+    def get(self, i):
+        """Reads joke number i from disk and returns (setup, punchline)."""
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offsets[i])
+            return parse_joke(f.readline().decode('utf-8', errors='replace'))
+
+    def reset_order(self):
+        self.order = array('l', range(len(self.offsets)))
+        self.cursor = 0
+
+    def next_joke(self):
+        """Returns the next joke of a shuffled order; every joke is served once per round."""
+        n = len(self.order)
+        if n == 0: return None
+        if self.cursor >= n:
+            self.cursor = 0
+        #Incremental Fisher-Yates: pick the next joke from the unserved tail
+        j = random.randint(self.cursor, n - 1)
+        if n > 1 and self.cursor == 0 and self.order[j] == self.last_served:
+            j = (j + 1) % n #Do not repeat a joke across rounds
+        self.order[self.cursor], self.order[j] = self.order[j], self.order[self.cursor]
+        self.last_served = self.order[self.cursor]
+        self.cursor += 1
+        return self.get(self.last_served)
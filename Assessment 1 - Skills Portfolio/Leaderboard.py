@@ -0,0 +1,79 @@
+#Persistent MathQuiz leaderboard in a local SQLite file.
+#WAL mode plus a busy timeout lets several quiz processes on the same machine write
+#at once; inserts are batched on a background thread and top-k reads use an index.
+#Usage: python Leaderboard.py [difficulty] [k]     (prints the top scores)
+import sys
+import threading
+import time
+from QuizAnalytics import BatchWriter, open_database
+
+LEADERBOARD_DB = "leaderboard.db"
+TOP_K = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id         INTEGER PRIMARY KEY,
+    score      INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL,
+    duration_s REAL    NOT NULL,
+    ts         REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_difficulty ON scores (difficulty, score DESC, duration_s);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, duration_s);
+"""
+INSERT = "INSERT INTO scores (score, difficulty, duration_s, ts) VALUES (?, ?, ?, ?)"
+
+#Best score first; the faster quiz wins a tie, then the earlier one
+def _rank_key(row): return (-row[0], row[2], row[3])
+
+
+class Leaderboard:
+    def __init__(self, path=LEADERBOARD_DB):
+        self.path = path
+        self.pending = [] #Rows queued but not yet committed, so top_k() sees them immediately
+        self.lock = threading.Lock()
+        self.writer = BatchWriter(path, SCHEMA, INSERT, on_commit=self._committed)
+        self.conn = None #Read connection, opened lazily on the UI thread
+
+    def add(self, score, difficulty, duration_s):
+        row = (int(score), int(difficulty), float(duration_s), time.time())
+        with self.lock:
+            self.pending.append(row)
+        self.writer.put(row)
+
+    def _committed(self, batch, ok=True):
+        #Written rows are now in the table; rows that failed were never saved, so stop showing them
+        with self.lock:
+            for row in batch:
+                self.pending.remove(row)
+
+    def top_k(self, k=TOP_K, difficulty=None):
+        """Returns up to k rows of (score, difficulty, duration_s, ts), best first."""
+        if self.conn is None:
+            self.conn = open_database(self.path, SCHEMA)
+        #Both queries are answered by walking the first k entries of an index
+        if difficulty is None:
+            rows = self.conn.execute("SELECT score, difficulty, duration_s, ts FROM scores "
+                                     "ORDER BY score DESC, duration_s LIMIT ?", (k,)).fetchall()
+        else:
+            rows = self.conn.execute("SELECT score, difficulty, duration_s, ts FROM scores WHERE difficulty = ? "
+                                     "ORDER BY score DESC, duration_s LIMIT ?", (difficulty, k)).fetchall()
+        with self.lock:
+            pending = [r for r in self.pending if difficulty is None or r[1] == difficulty]
+        #A row committed during the query can appear in both lists, so merge as a set
+        return sorted(set(rows).union(pending), key=_rank_key)[:k]
+
+    def close(self):
+        self.writer.close()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+if __name__ == "__main__":
+    board = Leaderboard()
+    difficulty = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    for i, (score, level, duration, ts) in enumerate(board.top_k(k, difficulty), 1):
+        print(f"{i:>3}. {score:>3} pts  level {level}  {duration:6.1f} s  {time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))}")
+    board.close()
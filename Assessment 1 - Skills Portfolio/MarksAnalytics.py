@@ -0,0 +1,147 @@
+#Per-component analytics for a cohort: mean, standard deviation, median and distribution of each
+#course mark, the coursework and exam totals, the coursework-to-exam correlation and the average
+#of every component per grade. The work is done by Counter(zip(...)) over the mark columns, which
+#runs at C speed; everything after that loops over distinct mark values (at most a few thousand).
+#Usage: python MarksAnalytics.py [FILE]     (defaults to studentMarks.txt)
+import math
+import operator
+import sys
+import time
+from collections import Counter
+from StudentRepository import GRADE_BOUNDARIES, STUDENTS_FILE, percentage_of, grade_for
+
+#Component -> (label, maximum mark, band width for the distribution)
+COMPONENTS = {
+    "course1": ("Course 1", 20, 5),
+    "course2": ("Course 2", 20, 5),
+    "course3": ("Course 3", 20, 5),
+    "coursework": ("Coursework", 60, 10),
+    "exam": ("Exam", 100, 10),
+    "total": ("Overall Total", 160, 20),
+}
+
+
+class ComponentStats:
+    """Summary of one component, computed from a value -> count histogram."""
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.count = n = sum(histogram.values())
+        self.sum = sum(value * c for value, c in histogram.items())
+        self.sum_squares = sum(value * value * c for value, c in histogram.items())
+        self.mean = self.sum / n if n else 0.0
+        #Integer sums keep the variance exact: (n * sum(x^2) - sum(x)^2) / n^2
+        self.stdev = math.sqrt(self.spread()) / n if n else 0.0
+        self.minimum = min(histogram) if n else None
+        self.maximum = max(histogram) if n else None
+        self.median = self.quantile(0.5)
+
+    def spread(self):
+        """n * sum(x^2) - sum(x)^2, exact: n^2 times the population variance."""
+        return self.count * self.sum_squares - self.sum * self.sum
+
+    def quantile(self, q):
+        """Lower q-quantile from the histogram (None for an empty cohort)."""
+        if not self.count: return None
+        target, seen = q * (self.count - 1), 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if seen > target: return value
+        return self.maximum
+
+    def bands(self, maximum, width):
+        """[(low, high, count)] over 0..maximum in steps of 'width'; out-of-range marks go in the end bands."""
+        result = [[low, min(low + width - 1, maximum), 0] for low in range(0, maximum + 1, width)]
+        for value, c in self.histogram.items():
+            result[min(max(value, 0), maximum) // width][2] += c
+        return [tuple(band) for band in result]
+
+
+class CohortAnalytics:
+    """All component statistics for one set of mark columns."""
+    def __init__(self, course1, course2, course3, exam):
+        coursework = list(map(operator.add, map(operator.add, course1, course2), course3))
+        totals = list(map(operator.add, coursework, exam))
+        self.count = len(totals)
+
+        #(coursework, exam) pairs: at most 61 x 101 distinct keys, whatever the cohort size
+        pairs = Counter(zip(coursework, exam))
+        by_course = {name: Counter(zip(column, totals))
+                     for name, column in (("course1", course1), ("course2", course2), ("course3", course3))}
+
+        histograms = {name: Counter() for name in COMPONENTS}
+        for name, counter in by_course.items():
+            for (value, _), c in counter.items(): histograms[name][value] += c
+        sum_xy = 0
+        for (cw, ex), c in pairs.items():
+            histograms["coursework"][cw] += c
+            histograms["exam"][ex] += c
+            histograms["total"][cw + ex] += c
+            sum_xy += cw * ex * c
+        self.components = {name: ComponentStats(histograms[name]) for name in COMPONENTS}
+        self.correlation = self._pearson(sum_xy)
+
+        #Per-grade sums: a grade depends only on the total, so look it up once per distinct total
+        grade_of = {total: grade_for(percentage_of(total)) for total in histograms["total"]}
+        self.grade_counts = Counter()
+        sums = {grade: Counter() for grade, _ in GRADE_BOUNDARIES}
+        for (cw, ex), c in pairs.items():
+            grade = grade_of[cw + ex]
+            self.grade_counts[grade] += c
+            sums[grade]["coursework"] += cw * c; sums[grade]["exam"] += ex * c; sums[grade]["total"] += (cw + ex) * c
+        for name, counter in by_course.items():
+            for (value, total), c in counter.items(): sums[grade_of[total]][name] += value * c
+        self.grade_averages = {grade: {name: sums[grade][name] / self.grade_counts[grade] for name in COMPONENTS}
+                               for grade, _ in GRADE_BOUNDARIES if self.grade_counts[grade]}
+
+    @classmethod
+    def from_students(cls, students):
+        return cls([s.course1 for s in students], [s.course2 for s in students],
+                   [s.course3 for s in students], [s.exam_mark for s in students])
+
+    def _pearson(self, sum_xy):
+        """Coursework-to-exam correlation from exact integer sums (None if either side is constant)."""
+        cw, ex = self.components["coursework"], self.components["exam"]
+        denominator = cw.spread() * ex.spread()
+        if not denominator: return None
+        return (self.count * sum_xy - cw.sum * ex.sum) / math.sqrt(denominator)
+
+    def format_report(self):
+        lines = [f"  Students: {self.count}", ""]
+        lines.append(f"  {'Component':<14}{'Mean':>7}{'Stdev':>7}{'Min':>5}{'Median':>7}{'Max':>5}")
+        for name, (label, maximum, width) in COMPONENTS.items():
+            s = self.components[name]
+            if not s.count: continue
+            lines.append(f"  {label:<14}{s.mean:>7.2f}{s.stdev:>7.2f}{s.minimum:>5}{s.median:>7}{s.maximum:>5}")
+        lines.append("")
+        correlation = "n/a" if self.correlation is None else f"{self.correlation:+.3f}"
+        lines.append(f"  Coursework vs Exam correlation: {correlation}")
+
+        lines += ["", "  Average per grade:",
+                  f"  {'Grade':<7}{'Count':>7}{'C1':>7}{'C2':>7}{'C3':>7}{'CW':>7}{'Exam':>7}"]
+        for grade, averages in self.grade_averages.items():
+            lines.append(f"  {grade:<7}{self.grade_counts[grade]:>7}" +
+                         "".join(f"{averages[name]:>7.1f}" for name in ("course1", "course2", "course3", "coursework", "exam")))
+
+        for name in ("coursework", "exam"):
+            label, maximum, width = COMPONENTS[name]
+            bands = self.components[name].bands(maximum, width)
+            peak = max((c for _, _, c in bands), default=0) or 1
+            lines += ["", f"  {label} distribution:"]
+            lines += [f"  {low:>3}-{high:<3} {c:>7} {'#' * round(20 * c / peak)}" for low, high, c in bands]
+        return "\n".join(lines)
+
+
+def main(argv):
+    from StudentRepository import read_student_file
+    filename = argv[0] if argv else STUDENTS_FILE
+    students, _ = read_student_file(filename)
+    start = time.perf_counter()
+    analytics = CohortAnalytics.from_students(students)
+    elapsed = time.perf_counter() - start
+    print(analytics.format_report())
+    print(f"\n  ({elapsed * 1000:.1f} ms for {len(students)} students)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+#Grade-distribution chart for StudentMarksExtension: a histogram of overall percentages in
+#BIN_WIDTH% bins with a box plot underneath, drawn on one Tk canvas. Everything is drawn from
+#bin counts and the per-total histogram, so drawing costs the same for 10 or 10 million
+#students. An edit moves one student between bins: only those bars (and the box) are moved,
+#with canvas.coords on the existing items; nothing is rebinned or recreated.
+from StudentRepository import percentage_of, grade_for
+
+BIN_WIDTH = 5 #Percentage points per bar
+BINS = 100 // BIN_WIDTH #The last bar also holds 100%
+MARGIN = {"left": 50, "right": 20, "top": 30, "bottom": 40}
+BOX_HEIGHT = 36 #Box plot strip under the bars
+GRADE_COLORS = {"A": "#1ABC9C", "B": "#3498DB", "C": "#F39C12", "D": "#E67E22", "F": "#E74C3C"}
+
+
+def bin_of(total):
+    """Bar index for an overall total (out-of-range marks fall in the end bars)."""
+    return min(max(int(percentage_of(total) // BIN_WIDTH), 0), BINS - 1)
+
+
+class GradeChart:
+    """Bars and box plot drawn once, then moved with canvas.coords as counts change."""
+    def __init__(self, canvas, totals, text_color="#ECF0F1", font=("Fira Code", 9)):
+        self.canvas = canvas
+        self.totals = totals #Counter of students per overall total, shared with the app and kept current
+        self.bins = [0] * BINS
+        for total, count in totals.items():
+            self.bins[bin_of(total)] += count
+        self.scale_max = None #Bar count the y axis is scaled to
+        self.text_color = text_color
+        self.font = font
+
+        #Every item is created here once; layout() and update() only move or relabel them
+        self.axis = canvas.create_line(0, 0, 0, 0, fill=text_color)
+        self.y_label = canvas.create_text(0, 0, anchor="e", fill=text_color, font=font)
+        self.x_labels = [canvas.create_text(0, 0, anchor="n", text=f"{i * BIN_WIDTH}", fill=text_color, font=font)
+                         for i in range(0, BINS + 1, 2)]
+        self.bars = [canvas.create_rectangle(0, 0, 0, 0, width=0, fill=GRADE_COLORS[grade_for(i * BIN_WIDTH)])
+                     for i in range(BINS)]
+        self.counts = [canvas.create_text(0, 0, anchor="s", fill=text_color, font=font) for _ in range(BINS)]
+        self.whisker = canvas.create_line(0, 0, 0, 0, fill=text_color, width=2)
+        self.box = canvas.create_rectangle(0, 0, 0, 0, outline=text_color, fill="#34495E", width=2)
+        self.median_line = canvas.create_line(0, 0, 0, 0, fill="#E74C3C", width=3)
+        self.summary = canvas.create_text(0, 0, anchor="nw", fill=text_color, font=font)
+        self.layout()
+
+    #Geometry
+    def _plot_area(self):
+        width = max(self.canvas.winfo_width(), 200)
+        height = max(self.canvas.winfo_height(), 200)
+        return (MARGIN["left"], MARGIN["top"], width - MARGIN["right"],
+                height - MARGIN["bottom"] - BOX_HEIGHT - 20)
+
+    def _x(self, percent):
+        left, _, right, _ = self._plot_area()
+        return left + (right - left) * min(max(percent, 0), 100) / 100
+
+    def layout(self):
+        """Positions every item for the current canvas size (on open, resize or a new scale)."""
+        left, top, right, bottom = self._plot_area()
+        self.canvas.coords(self.axis, left, top, left, bottom, right, bottom)
+        for i, item in enumerate(self.x_labels):
+            self.canvas.coords(item, self._x(i * 2 * BIN_WIDTH), bottom + 4)
+        self.scale_max = max(self.bins) or 1
+        self.canvas.coords(self.y_label, left - 6, top)
+        self.canvas.itemconfigure(self.y_label, text=str(self.scale_max))
+        for i in range(BINS):
+            self._layout_bar(i)
+        self._layout_box()
+
+    def _layout_bar(self, i):
+        left, top, right, bottom = self._plot_area()
+        x0, x1 = self._x(i * BIN_WIDTH) + 1, self._x((i + 1) * BIN_WIDTH) - 1
+        y = bottom - (bottom - top) * self.bins[i] / self.scale_max
+        self.canvas.coords(self.bars[i], x0, y, x1, bottom)
+        self.canvas.coords(self.counts[i], (x0 + x1) / 2, y - 2)
+        self.canvas.itemconfigure(self.counts[i], text=str(self.bins[i]) if self.bins[i] else "")
+
+    def _quartiles(self):
+        #Five-number summary from the per-total histogram (at most 161 distinct totals)
+        size = sum(self.totals.values())
+        if not size: return None
+        targets = [0, (size - 1) * 0.25, (size - 1) * 0.5, (size - 1) * 0.75, size - 1]
+        result, seen, values = [], 0, sorted(self.totals.items())
+        for total, count in values:
+            seen += count
+            while len(result) < len(targets) and seen > targets[len(result)]:
+                result.append(percentage_of(total))
+        return result, size
+
+    def _layout_box(self):
+        _, _, _, bottom = self._plot_area()
+        top, base = bottom + 24, bottom + 24 + BOX_HEIGHT
+        middle = (top + base) / 2
+        summary = self._quartiles()
+        if summary is None:
+            for item in (self.whisker, self.box, self.median_line): self.canvas.coords(item, 0, 0, 0, 0)
+            self.canvas.itemconfigure(self.summary, text="No students")
+            return
+        (low, q1, median, q3, high), size = summary
+        self.canvas.coords(self.whisker, self._x(low), middle, self._x(high), middle)
+        self.canvas.coords(self.box, self._x(q1), top, self._x(q3), base)
+        self.canvas.coords(self.median_line, self._x(median), top, self._x(median), base)
+        self.canvas.coords(self.summary, MARGIN["left"], 6)
+        self.canvas.itemconfigure(self.summary, text=f"{size} students   min {low:.1f}%  Q1 {q1:.1f}%  "
+                                                     f"median {median:.1f}%  Q3 {q3:.1f}%  max {high:.1f}%")
+
+    #Incremental updates
+    def update(self, old_total, new_total):
+        """One student moved from old_total to new_total (either None for an add or delete).
+        The shared totals Counter must already reflect the change."""
+        changed = set()
+        for total, delta in ((old_total, -1), (new_total, 1)):
+            if total is None: continue
+            i = bin_of(total)
+            self.bins[i] += delta
+            changed.add(i)
+        if (max(self.bins) or 1) != self.scale_max:
+            self.layout() #The y scale changed, so every bar height changes
+            return
+        for i in changed:
+            self._layout_bar(i)
+        self._layout_box()
@@ -0,0 +1,101 @@
+#Transparent compression for marks files: a name ending in .gz, .xz or .bz2 is read and written
+#through the matching standard-library codec, as a stream. Loading never inflates the whole
+#file: ParallelLoader.load_columns_stream parses fixed-size chunks as they are decompressed.
+#Usage:
+#   python MarksCodecs.py compress FILE [LEVEL]     (writes FILE.gz, FILE.xz and FILE.bz2)
+#   python MarksCodecs.py benchmark [rows]          (load/save speed against compression level)
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import time
+
+#Suffix -> (module, keyword for the compression level, default level)
+CODECS = {
+    ".gz": (gzip, "compresslevel", 6),
+    ".xz": (lzma, "preset", 6),
+    ".bz2": (bz2, "compresslevel", 9),
+}
+BENCHMARK_LEVELS = {".gz": (1, 6, 9), ".xz": (0, 3, 6), ".bz2": (1, 9)}
+
+
+def codec_for(path):
+    """The CODECS entry for a compressed file name, or None for plain text."""
+    return CODECS.get(os.path.splitext(str(path))[1].lower())
+
+
+def is_compressed(path):
+    return codec_for(path) is not None
+
+
+def open_marks(path, mode="r", encoding=None, level=None):
+    """Opens a marks file in text mode ('r' or 'w'), compressed or not, with universal newlines.
+    Binary modes ('rb', 'wb') give the raw decompressed/compressing stream."""
+    codec = codec_for(path)
+    if codec is None:
+        return open(path, mode, encoding=encoding) if "b" not in mode else open(path, mode)
+    module, level_keyword, default_level = codec
+    options = {}
+    if "w" in mode:
+        options[level_keyword] = default_level if level is None else level
+    if "b" in mode:
+        return module.open(path, mode, **options)
+    return module.open(path, mode + "t", encoding=encoding, **options)
+
+
+def compress(path, suffix, level=None, source=None):
+    """Streams a plain file (default 'path') into path + suffix. Returns the new file name."""
+    target = path + suffix
+    with open(source or path, "rb") as src, open_marks(target, "wb", level=level) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    return target
+
+
+def benchmark(rows=500_000):
+    import contextlib, io, tempfile
+    from ParallelLoader import load_columns, write_sample
+    from StudentRepository import write_student_file
+    plain = os.path.join(tempfile.gettempdir(), f"marks_codecs_{rows}.txt")
+    if not os.path.exists(plain): write_sample(plain, rows)
+    size = os.path.getsize(plain)
+
+    def timed_load(path):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            columns, _ = load_columns(path, 1)
+        return time.perf_counter() - start, columns
+
+    base_time, columns = timed_load(plain)
+    students = columns.students()
+    print(f"{plain}: {size / 1e6:.1f} MB, {len(students)} records")
+    print(f"{'file':>10} {'level':>5} {'ratio':>6} {'save MB/s':>10} {'load MB/s':>10}")
+    print(f"{'plain':>10} {'-':>5} {1.0:>6.2f} {'-':>10} {size / 1e6 / base_time:>10.1f}")
+    for suffix, levels in BENCHMARK_LEVELS.items():
+        module, keyword, _ = CODECS[suffix]
+        for level in levels:
+            path = plain + suffix
+            start = time.perf_counter()
+            write_student_file(path, students, level=level)
+            saved = time.perf_counter() - start
+            load_time, loaded = timed_load(path)
+            ok = len(loaded) == len(students)
+            print(f"{suffix:>10} {level:>5} {size / os.path.getsize(path):>6.2f} {size / 1e6 / saved:>10.1f} "
+                  f"{size / 1e6 / load_time:>10.1f}{'' if ok else '  MISMATCH'}")
+            os.remove(path)
+
+
+def main(argv):
+    if argv[:1] == ["benchmark"]:
+        benchmark(int(argv[1]) if len(argv) > 1 else 500_000); return 0
+    if argv[:1] == ["compress"] and len(argv) in (2, 3):
+        for suffix in CODECS:
+            print(f"Wrote {compress(argv[1], suffix, int(argv[2]) if len(argv) == 3 else None)}")
+        return 0
+    print("Usage: python MarksCodecs.py compress FILE [LEVEL] | benchmark [rows]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
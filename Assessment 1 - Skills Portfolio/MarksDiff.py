@@ -0,0 +1,312 @@
+#Diff and patch for two versions of a marks file (plain or .gz/.xz/.bz2).
+#The files are hash-joined on student_number. Large inputs are first split by a hash of the
+#number into PARTITIONS temporary files (a grace hash join), so only one partition of the old
+#file is held in memory at a time. Results are written in file order by merging the sorted
+#per-partition outputs, so memory stays bounded by the partition size, not the file size.
+#
+#A diff is JSON Lines, one operation per line:
+#   {"op": "remove", "number": "8439", "line": 5, "record": {...}}
+#   {"op": "change", "number": "8439", "line": 5, "changes": {"exam_mark": [60, 72]}}
+#   {"op": "add", "number": "9001", "line": 12, "record": {...}}
+#Removes and changes come in old-file order, then adds in new-file order ('line' is 1-based).
+#Patching keeps the old order, applies removes and changes, and appends the adds.
+#Usage:
+#   python MarksDiff.py diff OLD NEW [-o DIFF.jsonl] [--partitions N]
+#   python MarksDiff.py patch OLD DIFF.jsonl -o OUT [--partitions N]
+#   python MarksDiff.py benchmark [rows]
+import heapq
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import zlib
+from collections import Counter
+from MarksCodecs import is_compressed, open_marks
+
+FIELDS = ("name", "course1", "course2", "course3", "exam_mark")
+PARTITION_BYTES = 32 * 1024 * 1024 #Target text per partition; smaller inputs are joined in memory
+COMPRESSION_GUESS = 4 #Text bytes per compressed byte, for sizing partitions
+
+
+def warn(message):
+    print(message, file=sys.stderr)
+
+
+def parse_record(text):
+    """(number, (name, c1, c2, c3, exam)) for a valid record line, else None (same rules as the loader)."""
+    parts = [p.strip() for p in text.split(',')]
+    if len(parts) != 6: return None
+    try:
+        return parts[0], (parts[1], int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5]))
+    except ValueError:
+        return None
+
+
+def format_record(number, fields):
+    name, c1, c2, c3, exam = fields
+    return f"{number}, {name}, {c1}, {c2}, {c3}, {exam}"
+
+
+def read_records(path):
+    """Streams (line, number, fields) for every valid record; skipped lines are reported on stderr."""
+    with open_marks(path, "r") as f:
+        f.readline() #Header count: recomputed when a file is written
+        for line, text in enumerate(f, start=2):
+            text = text.rstrip("\n")
+            record = parse_record(text)
+            if record is None:
+                warn(f"{path}:{line}: skipping invalid line: {text.strip()}")
+                continue
+            yield line, record[0], record[1]
+
+
+def partition_count(*paths):
+    size = max(os.path.getsize(p) * (COMPRESSION_GUESS if is_compressed(p) else 1) for p in paths)
+    return max(1, math.ceil(size / PARTITION_BYTES))
+
+
+def partition_of(number, parts):
+    return zlib.crc32(number.encode("utf-8")) % parts
+
+
+class Partitions:
+    """Text rows split by partition: lists in memory for one partition, temporary files otherwise."""
+    def __init__(self, parts, directory, name):
+        self.parts = parts
+        if parts == 1:
+            self.rows = [[]]
+        else:
+            self.paths = [os.path.join(directory, f"{name}_{i}.txt") for i in range(parts)]
+            self.files = [open(path, "w", encoding="utf-8", newline="\n") for path in self.paths]
+
+    def add(self, index, row):
+        if self.parts == 1: self.rows[0].append(row)
+        else: self.files[index].write(row + "\n")
+
+    def close(self):
+        if self.parts > 1:
+            for f in self.files: f.close()
+
+    def read(self, index):
+        if self.parts == 1:
+            yield from self.rows[0]
+            self.rows[0] = []
+            return
+        with open(self.paths[index], encoding="utf-8", newline="\n") as f:
+            for row in f:
+                yield row[:-1]
+        os.remove(self.paths[index])
+
+
+def _split(path, parts, directory, name):
+    """Partitions a marks file: parsed records in memory, 'line<TAB>record text' rows on disk."""
+    partitions = Partitions(parts, directory, name)
+    for line, number, fields in read_records(path):
+        if parts == 1:
+            partitions.add(0, (line, number, fields))
+        else:
+            partitions.add(partition_of(number, parts), f"{line}\t{format_record(number, fields)}")
+    partitions.close()
+    return partitions
+
+
+def _records(partitions, index):
+    if partitions.parts == 1:
+        yield from partitions.read(index)
+        return
+    for row in partitions.read(index):
+        line, text = row.split("\t", 1)
+        number, fields = parse_record(text)
+        yield int(line), number, fields
+
+
+def _merged(sorted_runs):
+    """Merges per-partition lists of (key, text) already sorted by key; yields the text."""
+    for _, text in heapq.merge(*sorted_runs, key=lambda item: item[0]):
+        yield text
+
+
+def _spill(items, parts, directory, name, index):
+    #Keeps a sorted partition result in memory for one partition, else writes it to a run file
+    items.sort(key=lambda item: item[0])
+    if parts == 1: return items
+    path = os.path.join(directory, f"{name}_{index}.txt")
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for key, text in items:
+            f.write(f"{','.join(map(str, key))}\t{text}\n")
+
+    def run():
+        with open(path, encoding="utf-8", newline="\n") as f:
+            for row in f:
+                key, text = row[:-1].split("\t", 1)
+                yield tuple(map(int, key.split(","))), text
+        os.remove(path)
+    return run()
+
+
+def diff(old_path, new_path, out, parts=None):
+    """Writes the JSON Lines diff from old_path to new_path to the open text stream 'out'.
+    Returns a Counter of operations."""
+    parts = parts or partition_count(old_path, new_path)
+    counts = Counter()
+    with tempfile.TemporaryDirectory(prefix="marks_diff_") as directory:
+        old_parts = _split(old_path, parts, directory, "old")
+        new_parts = _split(new_path, parts, directory, "new")
+        runs = []
+        for index in range(parts):
+            old = {} #number -> (line, fields) for this partition only
+            for line, number, fields in _records(old_parts, index):
+                if number in old: warn(f"{old_path}:{line}: duplicate student number {number} ignored"); continue
+                old[number] = line, fields
+            seen, items = set(), []
+
+            def emit(key, op):
+                counts[op["op"]] += 1
+                items.append((key, json.dumps(op)))
+            for line, number, fields in _records(new_parts, index):
+                if number in seen: warn(f"{new_path}:{line}: duplicate student number {number} ignored"); continue
+                seen.add(number)
+                previous = old.pop(number, None)
+                if previous is None:
+                    emit((1, line), {"op": "add", "number": number, "line": line, "record": dict(zip(FIELDS, fields))})
+                    continue
+                changes = {field: [a, b] for field, a, b in zip(FIELDS, previous[1], fields) if a != b}
+                if changes:
+                    emit((0, previous[0]), {"op": "change", "number": number, "line": previous[0], "changes": changes})
+            for number, (line, fields) in old.items():
+                emit((0, line), {"op": "remove", "number": number, "line": line, "record": dict(zip(FIELDS, fields))})
+            runs.append(_spill(items, parts, directory, "diff", index))
+        for text in _merged(runs):
+            out.write(text + "\n")
+    return counts
+
+
+def read_diff(path):
+    with open_marks(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip(): yield json.loads(line)
+
+
+def patch(old_path, diff_path, out_path, parts=None):
+    """Applies a diff to old_path and writes the result to out_path. Returns the number of
+    conflicts (operations whose student or old values do not match old_path), which are skipped."""
+    parts = parts or partition_count(old_path, diff_path)
+    conflicts = 0
+    with tempfile.TemporaryDirectory(prefix="marks_patch_") as directory:
+        old_parts = _split(old_path, parts, directory, "old")
+        op_parts = Partitions(parts, directory, "ops")
+        adds = 0
+        for op in read_diff(diff_path):
+            op_parts.add(partition_of(op["number"], parts), json.dumps(op))
+            adds += op["op"] == "add"
+        op_parts.close()
+
+        runs, kept, rejected = [], 0, set() #rejected: numbers of adds that already exist
+        for index in range(parts):
+            ops = {}
+            for row in op_parts.read(index):
+                op = json.loads(row)
+                ops.setdefault(op["number"], []).append(op)
+            items, seen = [], set()
+            for line, number, fields in _records(old_parts, index):
+                record = dict(zip(FIELDS, fields))
+                pending = ops.pop(number, []) if number not in seen else []
+                seen.add(number)
+                removed = False
+                for op in pending:
+                    if op["op"] == "add":
+                        warn(f"conflict: student {number} added by the diff already exists"); conflicts += 1
+                        rejected.add(number)
+                    elif op["op"] == "remove" and not removed:
+                        removed = True
+                    elif op["op"] == "change" and not removed:
+                        if any(record[field] != old for field, (old, _) in op["changes"].items()):
+                            warn(f"conflict: student {number} does not have the old values in the diff"); conflicts += 1
+                            continue
+                        record.update({field: new for field, (_, new) in op["changes"].items()})
+                if removed: continue
+                kept += 1
+                items.append(((line,), format_record(number, tuple(record[f] for f in FIELDS))))
+            for number, pending in ops.items():
+                for op in pending:
+                    if op["op"] != "add":
+                        warn(f"conflict: student {number} to {op['op']} is not in {old_path}"); conflicts += 1
+            runs.append(_spill(items, parts, directory, "patched", index))
+
+        with open_marks(out_path, "w") as out:
+            out.write(f"{kept + adds - len(rejected)}\n")
+            for text in _merged(runs):
+                out.write(text + "\n")
+            for op in read_diff(diff_path): #Second pass over the diff keeps adds out of memory
+                if op["op"] == "add" and op["number"] not in rejected:
+                    out.write(format_record(op["number"], tuple(op["record"][f] for f in FIELDS)) + "\n")
+    return conflicts
+
+
+def benchmark(rows=1_000_000):
+    import random
+    from ParallelLoader import write_sample
+    directory = tempfile.gettempdir()
+    old_path = os.path.join(directory, f"marks_diff_old_{rows}.txt")
+    new_path = os.path.join(directory, f"marks_diff_new_{rows}.txt")
+    if not os.path.exists(old_path): write_sample(old_path, rows)
+    rng = random.Random(11)
+    with open(old_path) as src, open(new_path, "w") as dst:
+        dst.write(src.readline())
+        for text in src:
+            roll = rng.random()
+            if roll < 0.01: continue #Removed
+            if roll < 0.06 and parse_record(text): #Re-marked
+                number, fields = parse_record(text)
+                text = format_record(number, fields[:4] + (rng.randint(0, 100),)) + "\n"
+            dst.write(text)
+            if roll > 0.99: dst.write(f"N{rng.randrange(10 ** 9)}, New Student, 10, 10, 10, 50\n")
+    print(f"{rows} rows, {os.path.getsize(old_path) / 1e6:.0f} MB per file")
+    stderr, sys.stderr = sys.stderr, open(os.devnull, "w") #The sample has a few invalid lines
+    try:
+        for parts in (1, partition_count(old_path, new_path) * 4):
+            diff_path, out_path = new_path + ".diff", new_path + ".patched"
+            start = time.perf_counter()
+            with open(diff_path, "w", encoding="utf-8") as out:
+                counts = diff(old_path, new_path, out, parts)
+            diffed = time.perf_counter() - start
+            start = time.perf_counter(); conflicts = patch(old_path, diff_path, out_path, parts); patched = time.perf_counter() - start
+            same = ({n: f for _, n, f in read_records(out_path)} == {n: f for _, n, f in read_records(new_path)})
+            print(f"{parts:>3} partition(s): diff {diffed:6.2f} s  patch {patched:6.2f} s  "
+                  f"{dict(counts)}  conflicts {conflicts}  {'round trip OK' if same else 'MISMATCH'}")
+            os.remove(diff_path); os.remove(out_path)
+    finally:
+        sys.stderr.close(); sys.stderr = stderr
+
+
+def main(argv):
+    parts = None
+    if "--partitions" in argv:
+        i = argv.index("--partitions"); parts = int(argv[i + 1]); del argv[i:i + 2]
+    output = None
+    if "-o" in argv:
+        i = argv.index("-o"); output = argv[i + 1]; del argv[i:i + 2]
+    if argv[:1] == ["benchmark"]:
+        benchmark(int(argv[1]) if len(argv) > 1 else 1_000_000); return 0
+    if argv[:1] == ["diff"] and len(argv) == 3:
+        out = open_marks(output, "w", encoding="utf-8") if output else sys.stdout
+        try:
+            counts = diff(argv[1], argv[2], out, parts)
+        finally:
+            if output: out.close()
+        warn(f"{counts['add']} added, {counts['remove']} removed, {counts['change']} changed")
+        return 0
+    if argv[:1] == ["patch"] and len(argv) == 3 and output:
+        conflicts = patch(argv[1], argv[2], output, parts)
+        warn(f"Wrote '{output}'" + (f" with {conflicts} conflict(s) skipped" if conflicts else ""))
+        return 2 if conflicts else 0
+    print("Usage: python MarksDiff.py diff OLD NEW [-o DIFF.jsonl] [--partitions N]\n"
+          "       python MarksDiff.py patch OLD DIFF.jsonl -o OUT [--partitions N]\n"
+          "       python MarksDiff.py benchmark [rows]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,157 @@
+#Validation pass for marks files, run on the column buffers built by ParallelLoader.
+#Each check looks at a whole column at once (min/max, one set() for duplicates, one regex
+#over all names) and only walks the column row by row when that check has found a problem.
+#Usage:
+#   python MarksValidation.py check FILE [--json]
+#   python MarksValidation.py benchmark [rows]
+import json
+import re
+import sys
+import time
+from collections import Counter
+from ParallelLoader import load_columns
+
+COURSEWORK_MAX = 20
+EXAM_MAX = 100
+#Names that are blank, contain control characters, or have no letters at all
+BAD_NAME = re.compile(r"^(?:(?![^\W\d_])[^\n])*$|^[^\n]*[\x00-\x08\x0b-\x1f\x7f][^\n]*$", re.M)
+
+#Error kinds, in report order
+KINDS = {
+    "header_invalid": "File is empty or its header is not a whole number",
+    "header_count": "Header count does not match the records loaded",
+    "format": "Line does not have 6 comma-separated fields",
+    "invalid_mark": "Mark is not a whole number",
+    "coursework_range": f"Coursework mark outside 0-{COURSEWORK_MAX}",
+    "exam_range": f"Exam mark outside 0-{EXAM_MAX}",
+    "empty_number": "Blank student number",
+    "duplicate_number": "Student number already used on an earlier line",
+    "bad_name": "Name is blank, has no letters or contains control characters",
+}
+
+
+class ValidationReport:
+    """Every problem found in one file: (line, kind, detail) tuples plus counts per kind."""
+    def __init__(self, path, expected=None, loaded=0):
+        self.path = path
+        self.expected = expected
+        self.loaded = loaded
+        self.issues = []
+
+    def add(self, line, kind, detail):
+        self.issues.append((line, kind, detail))
+
+    @property
+    def counts(self):
+        return Counter(kind for _, kind, _ in self.issues)
+
+    @property
+    def ok(self):
+        return not self.issues
+
+    def sorted_issues(self):
+        return sorted(self.issues, key=lambda issue: issue[0])
+
+    def summary(self, limit=10):
+        """Short text for dialogs and the console: counts per kind, then the first few lines."""
+        if self.ok:
+            return f"{self.loaded} records, no problems found."
+        counts = self.counts
+        lines = [f"{self.loaded} records loaded, {len(self.issues)} problem(s):"]
+        lines += [f"  {counts[kind]:>6} x {text}" for kind, text in KINDS.items() if counts[kind]]
+        lines += [f"  line {line}: {detail}" for line, _, detail in self.sorted_issues()[:limit]]
+        if len(self.issues) > limit:
+            lines.append(f"  ... and {len(self.issues) - limit} more")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {"path": self.path, "expected": self.expected, "loaded": self.loaded,
+                "counts": dict(self.counts),
+                "issues": [{"line": line, "kind": kind, "detail": detail} for line, kind, detail in self.sorted_issues()]}
+
+
+def _out_of_range(report, columns, column, kind, label, high):
+    #Fast path: one min() and one max() over the whole column
+    if not len(column) or (min(column) >= 0 and max(column) <= high): return
+    lines = columns.lines
+    for i, value in enumerate(column):
+        if value < 0 or value > high:
+            report.add(lines[i], kind, f"{label} = {value} (allowed 0-{high})")
+
+
+def validate_columns(columns, expected, path=None):
+    """Runs every check over loaded columns. Returns a ValidationReport."""
+    report = ValidationReport(path, expected, len(columns))
+    lines = columns.lines
+
+    if expected is not None and expected != len(columns):
+        report.add(1, "header_count", f"header says {expected}, {len(columns)} records loaded")
+    for line, kind, text in columns.skipped:
+        report.add(line, kind, text)
+
+    for field, label, high in (("course1", "Course 1", COURSEWORK_MAX), ("course2", "Course 2", COURSEWORK_MAX),
+                               ("course3", "Course 3", COURSEWORK_MAX), ("exam_mark", "Exam", EXAM_MAX)):
+        _out_of_range(report, columns, getattr(columns, field), "exam_range" if field == "exam_mark" else "coursework_range",
+                      label, high)
+
+    #Duplicates: a single set() when every number is unique, a dict walk otherwise
+    numbers = columns.numbers
+    if len(set(numbers)) != len(numbers) or "" in numbers:
+        first_seen = {}
+        for i, number in enumerate(numbers):
+            if not number:
+                report.add(lines[i], "empty_number", "blank student number")
+            elif number in first_seen:
+                report.add(lines[i], "duplicate_number", f"{number} (first used on line {lines[first_seen[number]]})")
+            else:
+                first_seen[number] = i
+
+    #Names: one regex scan over all names joined by newlines (skipped for a header-only file,
+    #where the empty join would still match the blank-name pattern once)
+    if not columns.names:
+        return report
+    joined = "\n".join(columns.names)
+    index, position = 0, 0
+    for match in BAD_NAME.finditer(joined):
+        index += joined.count("\n", position, match.start()); position = match.start()
+        report.add(lines[index], "bad_name", f"name {match.group()!r}")
+    return report
+
+
+def validate_file(path, workers=None):
+    """Loads and validates a marks file. Returns (columns, report); columns is None if the header is bad."""
+    try:
+        columns, expected = load_columns(path, workers, echo=False)
+    except UnicodeDecodeError:
+        raise
+    except ValueError as e:
+        report = ValidationReport(path)
+        report.add(1, "header_invalid", str(e))
+        return None, report
+    return columns, validate_columns(columns, expected, path)
+
+
+def benchmark(rows=1_000_000):
+    import contextlib, io, os, tempfile
+    from ParallelLoader import write_sample
+    path = os.path.join(tempfile.gettempdir(), f"marks_validation_{rows}.txt")
+    if not os.path.exists(path): write_sample(path, rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter(); columns, expected = load_columns(path, 1); loaded = time.perf_counter() - start
+    start = time.perf_counter(); report = validate_columns(columns, expected, path); checked = time.perf_counter() - start
+    print(f"{rows} rows: load {loaded:.2f} s, validate {checked:.2f} s "
+          f"(+{100 * checked / loaded:.0f}% on the load), {len(report.issues)} problems")
+
+
+def main(argv):
+    if argv[:1] == ["benchmark"]:
+        benchmark(int(argv[1]) if len(argv) > 1 else 1_000_000); return 0
+    if argv[:1] != ["check"] or len(argv) < 2:
+        print("Usage: python MarksValidation.py check FILE [--json] | benchmark [rows]"); return 1
+    columns, report = validate_file(argv[1])
+    print(json.dumps(report.to_dict(), indent=2) if "--json" in argv else report.summary(limit=50))
+    return 0 if report.ok else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,8 +2,15 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import tkinter.font as tkFont
-import pygame # Import pygame for audio playback
 import math # Import math equations used in the background
+import time
+import uuid
+from SpriteScheduler import FRAME_MS, FrameClock, SpriteGroup
+from QuizAnalytics import ResultsLog
+from Leaderboard import Leaderboard
+from AdaptiveDifficulty import AdaptiveEngine
+from Problems import BASIC_OPERATIONS, EXTENDED_OPERATIONS, binary_problem, make_problem, format_terms
+from AudioManager import AudioManager, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH #pygame is imported lazily
 
 #Global Constants for Animation
 #This code portion was written with the help of an AI assistant
@@ -20,6 +27,13 @@ EQUATIONS_DATA = [
     ("cos²θ + sin²θ = 1", 22, "#DAA520"),
 ]
 
+RESIZE_SETTLE_MS = 200 #Quiet time after the last <Configure> before the equations are respawned
+ANIMATED_PAGES = ("Welcome", "Instructions", "Menu") #Pages drawn over the floating equations
+
+ADAPTIVE_LEVEL = 4 #Menu level whose operand ranges follow the player's running performance
+QUESTIONS_PER_QUIZ = 10
+MAX_ATTEMPTS = 2 #A wrong first answer gets one more chance
+
 #Core Logic Functions
 #Determines min/max values based on difficulty (1-digit, 2-digit, 4-digit)
 def randomInt(d):
@@ -27,12 +41,19 @@ def randomInt(d):
     if d == 2: return random.randint(10, 99), random.randint(10, 99)
     if d == 3: return random.randint(1000, 9999), random.randint(1000, 9999)
     return 0, 0
-def decideOperation(): return random.choice(['+', '-'])
+def decideOperation(ops=BASIC_OPERATIONS): return random.choice(ops)
+
+#Builds one problem for a fixed difficulty level (shared with the quiz server)
+def createProblem(d, ops=BASIC_OPERATIONS):
+    op = decideOperation(ops)
+    if op in BASIC_OPERATIONS: return binary_problem(*randomInt(d), op)
+    return make_problem(d, op)
 
-#Checks if the answer is correct
-def isCorrect(ans, n1, n2, op):
-    try: return int(ans) == (n1 + n2 if op == '+' else n1 - n2)
-    except ValueError: return False
+#Checks if the answer is correct (compares with the problem's cached answer, no parsing)
+def isCorrect(ans, problem): return problem.check(ans)
+
+#Points for a correct answer: 10 on the first attempt, 5 on the second
+def awardPoints(attempts): return 10 if attempts == 0 else 5
 
 #Calculates rank based on score (out of 100)
 def displayResults(s):
@@ -43,8 +64,9 @@ def displayResults(s):
 
 #GUI Class
 class MathQuizApp:
-    def __init__(self, root):
+    def __init__(self, root, remote=None):
         self.root = root; root.title("Mental Math Cards"); root.geometry("400x600")
+        self.remote = remote #QuizClient when running as a thin client of QuizServer
         root.resizable(True, True); root.configure(bg="#E6F9E6")
         
         #Init states
@@ -52,24 +74,26 @@ class MathQuizApp:
         self.r_count, self.w_count = 0, 0 
         self.ans_val, self.timer_id, self.time_left = None, None, 0
         self.n1, self.n2, self.op = None, None, None
+        self.problem = None #Current Problem object (see Problems.py)
+        self.session_id, self.question_start = None, 0.0
+        self.results_log = ResultsLog() #Per-question results, written off the UI thread
+        self.adaptive = AdaptiveEngine() #Kept for the whole run so it remembers the player
+        self.leaderboard = Leaderboard() #Shared SQLite leaderboard, shown on the menu page
+        self.quiz_start = 0.0
         
         #Animation States
-        self.active_frame_name = "Welcome" #Tracks the current frame with animation
-        self.floating_elements = [] #Holds the currently animated elements
-        self.canvases = {} #Dictionary to store canvas references for animated frames
-        self.center_windows = {} #Dictionary to store center window IDs
-        self.animation_id = None
+        self.clock = FrameClock(root) #Single shared frame clock for all animated frames
+        self.page_windows = {} #Canvas window item of each built page on the shared background
+        self.current_page = None
+        self.canvas_size = (400, 600) #Last size seen by <Configure>
+        self.spawn_size = None #Canvas size the equations were spawned for
+        self.layout_job, self.settle_job = None, None
         
         #Audio Variables
         #sounds were added after learning from multiple videos on youtube.
-        self.click_sound = None 
-        self.correct_sound = None 
-        self.wrong_sound = None 
-        self.fx_channel = None 
-        self.timer_sound = None 
-        self.timer_channel = None
-
-        #Initializing Pygame Mixer, load music, and load sound effects
+        self.audio = AudioManager(frequency=44100, size=-16, channels=2, buffer=512)
+
+        #Starts the mixer, music and sound decoding in the background
         self.init_audio()
         
         #Defining the font
@@ -81,17 +105,26 @@ class MathQuizApp:
         self.k_font = tkFont.Font(family=font_name, size=18, weight="bold")
         self.n_font = (font_name, 50, 'bold') 
         self.f_font = tkFont.Font(family=font_name, size=100, weight="bold")
+        self.equation_fonts = {} #Cached fonts for the floating equations, keyed by size
+
+        #One background canvas for every page: the floating equations are created once and
+        #each page is a canvas window on top of it, shown or hidden by show_frame
+        self.bg_canvas = tk.Canvas(root, bg="#E6F9E6", highlightthickness=0)
+        self.bg_canvas.grid(row=0, column=0, sticky="nsew")
+        root.grid_rowconfigure(0, weight=1); root.grid_columnconfigure(0, weight=1)
+        self.background = self.clock.add_group(SpriteGroup(self.bg_canvas, margin=20))
+        self.bg_canvas.bind("<Configure>", self.on_canvas_resize)
 
         #Setup frames
         self.frames = {}; names = ["Welcome", "Instructions", "Menu", "Quiz"]
         for name in names:
-            frame = tk.Frame(root, bg="#E6F9E6"); self.frames[name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-        root.grid_rowconfigure(0, weight=1); root.grid_columnconfigure(0, weight=1)
+            self.frames[name] = tk.Frame(self.bg_canvas, bg="#E6F9E6")
 
         self.ans_disp = tk.StringVar(root, value="")
-        self.create_welcome_page(); self.create_instructions_page()
-        self.create_menu_page(); self.create_quiz_page()
+        #Pages are built on their first show_frame so the first paint only needs the Welcome page
+        self.page_builders = {"Welcome": self.create_welcome_page, "Instructions": self.create_instructions_page,
+                              "Menu": self.create_menu_page, "Quiz": self.create_quiz_page}
+        self.built_pages = set()
         self.show_frame("Welcome")
 
         #Bind closing event to stop music cleanly
@@ -99,18 +132,21 @@ class MathQuizApp:
 
 
     #Animation Helper Methods
-    #Creates the floating elements on a given canvas and returns their animation state.
-    def _create_floating_elements(self, canvas):
-        elements = []
+    #Creates the floating elements on the background canvas, replacing any earlier ones.
+    def _create_floating_elements(self, canvas, group):
         font_family = self.n_font[0]
+        group.clear()
         
-        #Get current canvas dimensions for initial placement
-        canvas.update_idletasks() #Ensure the dimensions are up to date
-        w = max(400, canvas.winfo_width())
-        h = max(600, canvas.winfo_height())
+        #Spawn inside the current canvas size so nothing starts off-screen after a resize
+        w = max(120, self.canvas_size[0])
+        h = max(120, self.canvas_size[1])
+        self.spawn_size = self.canvas_size
+        group.set_bounds(*self.canvas_size)
         
         for text, size, color in EQUATIONS_DATA:
-            font = tkFont.Font(family=font_family, size=size, weight="bold")
+            font = self.equation_fonts.get(size)
+            if font is None:
+                font = self.equation_fonts[size] = tkFont.Font(family=font_family, size=size, weight="bold")
             
             # Initializing random position, constrained slightly inside the canvas
             x = random.randint(50, w - 50)
@@ -122,203 +158,108 @@ class MathQuizApp:
             dx = random.choice([-1, 1]) * random.uniform(0.5, 1.5)
             dy = random.choice([-1, 1]) * random.uniform(0.5, 1.5)
             
-            elements.append({
-                'id': element_id,
-                'dx': dx,
-                'dy': dy,
-            })
-        return elements
-
-
-    #Recenter the main content frame when the canvas size changes
-    def recenter_content(self, event, frame_name):
-        canvas = self.canvases.get(frame_name)
-        center_window_id = self.center_windows.get(frame_name)
-        if canvas and center_window_id:
-            w = event.width
-            h = event.height
-            canvas.coords(center_window_id, w / 2, h / 2)
-
-    #Moves the floating equations and handles boundary collision.
-    def animate_equations(self):        
-        # Use the canvas associated with the currently animated frame
-        canvas = self.canvases.get(self.active_frame_name) 
-
-        if not canvas or not self.floating_elements:
-            #If the frame has switched or elements are cleared, stop the loop.
-            if self.animation_id:
-                self.root.after_cancel(self.animation_id)
-                self.animation_id = None
-            return
-
-        w = canvas.winfo_width()
-        h = canvas.winfo_height()
+            group.add(element_id, x, y, dx, dy)
+
+
+    #Resizing is coalesced: at most one layout per animation frame while the window is
+    #being dragged, and the equations are respawned once the size has settled
+    def on_canvas_resize(self, event):
+        self.canvas_size = (event.width, event.height)
+        if self.layout_job is None:
+            self.layout_job = self.root.after(FRAME_MS, self.recenter_content)
+        if self.settle_job is not None:
+            self.root.after_cancel(self.settle_job)
+        self.settle_job = self.root.after(RESIZE_SETTLE_MS, self.on_resize_settled)
+
+    #Recenter the visible page (hidden pages are placed when they are shown)
+    def recenter_content(self):
+        self.layout_job = None
+        w, h = self.canvas_size
+        self.background.set_bounds(w, h)
+        window = self.page_windows.get(self.current_page)
+        if window is None: return
+        if self.current_page in ANIMATED_PAGES:
+            self.bg_canvas.coords(window, w / 2, h / 2)
+        else:
+            self.bg_canvas.itemconfigure(window, width=w, height=h)
 
-        if w == 0 or h == 0:
-            self.animation_id = self.root.after(50, self.animate_equations)
-            return
+    def on_resize_settled(self):
+        self.settle_job = None
+        if self.background.sprites and self.spawn_size != self.canvas_size:
+            self._create_floating_elements(self.bg_canvas, self.background)
 
-        for element in self.floating_elements:
-            try:
-                x, y = canvas.coords(element['id'])
-                
-                #Safety check: if coords failed, skip this element
-                if not x or not y: continue
-                
-                new_x = x + element['dx']
-                new_y = y + element['dy']
-                text_margin = 20
-                
-                #Boundary Check and Bounce
-                if new_x < text_margin or new_x > w - text_margin:
-                    element['dx'] *= -1
-                    new_x = x + element['dx']
-                    
-                if new_y < text_margin or new_y > h - text_margin:
-                    element['dy'] *= -1
-                    new_y = y + element['dy']
-                    
-                canvas.coords(element['id'], new_x, new_y)
-            except Exception:
-                #Catch exception if element ID becomes invalid during a quick close/switch
-                pass
-
-        #Re-schedule the animation
-        self.animation_id = self.root.after(50, self.animate_equations) 
     #End Animation Helper Methods
 
 
     #Audio Handlers
+    #Sounds share a pooled set of channels; rapid keypad clicks are coalesced
     def play_click_sound(self):
-        if self.click_sound and self.fx_channel:
-            self.fx_channel.play(self.click_sound)
+        self.audio.play('click')
 
     def play_correct_sound(self):
-        if self.correct_sound and self.fx_channel:
-            self.fx_channel.play(self.correct_sound)
+        self.audio.play('correct')
 
     def play_wrong_sound(self):
-        if self.wrong_sound and self.fx_channel:
-            self.fx_channel.play(self.wrong_sound)
+        self.audio.play('wrong')
     
     def play_timer_sound(self):
-        if self.timer_sound and self.timer_channel:
-            self.timer_channel.play(self.timer_sound, loops=-1) 
+        self.audio.play('timer', loops=-1) 
 
     def stop_timer_sound(self):
-        if self.timer_channel and self.timer_channel.get_busy():
-            self.timer_channel.stop()
+        self.audio.stop('timer')
 
-    #Initializes pygame mixer and loads all audio effects
+    #Registers the music and sound effects; decoding happens off the UI thread
     def init_audio(self):
-        try:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-            pygame.mixer.music.load('bg.mp3')
-            pygame.mixer.music.play(-1) 
-            pygame.mixer.music.set_volume(0.5) 
-            
-            self.click_sound = pygame.mixer.Sound('click.mp3')
-            self.correct_sound = pygame.mixer.Sound('correct.mp3')
-            self.wrong_sound = pygame.mixer.Sound('wrong.mp3')
-            self.timer_sound = pygame.mixer.Sound('timer.mp3') 
-            
-            self.click_sound.set_volume(1.0)
-            self.correct_sound.set_volume(1.0)
-            self.wrong_sound.set_volume(1.0)
-            self.timer_sound.set_volume(0.8)
-
-            self.fx_channel = pygame.mixer.Channel(0)
-            self.timer_channel = pygame.mixer.Channel(1)
-            
-        except pygame.error as e:
-            print(f"Could not load audio file or initialize mixer: {e}. Check file names and location.")
+        self.audio.set_music('bg.mp3', volume=0.5)
+        self.audio.register('click', 'click.mp3', volume=1.0, priority=PRIORITY_LOW, coalesce_ms=30)
+        self.audio.register('correct', 'correct.mp3', volume=1.0, priority=PRIORITY_HIGH)
+        self.audio.register('wrong', 'wrong.mp3', volume=1.0, priority=PRIORITY_HIGH)
+        self.audio.register('timer', 'timer.mp3', volume=0.8, priority=PRIORITY_NORMAL)
+        self.audio.start()
 
     #Stops all sounds, stops animation, and destroys the window upon closing.
     def on_closing(self):
         self.stop_timer_sound() 
-        if self.animation_id:
-            self.root.after_cancel(self.animation_id)
-            self.animation_id = None
+        self.clock.close()
         
-        #Clean up floating elements on all canvases
-        for element in self.floating_elements:
-             try: element['canvas'].delete(element['id'])
-             except: pass
-        self.floating_elements = []
-
-
-        if pygame.mixer.get_init():
-            pygame.mixer.music.stop()
-            pygame.mixer.quit()
+        for job in (self.layout_job, self.settle_job):
+            if job is not None: self.root.after_cancel(job)
+        #Clean up the floating elements
+        self.background.clear()
+
+        self.audio.shutdown()
+        self.results_log.close()
+        self.leaderboard.close()
         self.root.destroy()
     #End Audio Handlers
 
 
     def show_frame(self, name): 
         self.play_click_sound() 
-        self.frames[name].tkraise()
-        
-        animated_frames = ["Welcome", "Instructions", "Menu"]
+        if name not in self.built_pages:
+            self.page_builders[name](); self.built_pages.add(name)
+        if name not in self.page_windows:
+            anchor = "center" if name in ANIMATED_PAGES else "nw"
+            self.page_windows[name] = self.bg_canvas.create_window(0, 0, window=self.frames[name], anchor=anchor)
+        for page, window in self.page_windows.items():
+            self.bg_canvas.itemconfigure(window, state="normal" if page == name else "hidden")
+        self.current_page = name
+        self.recenter_content()
+        if name == "Menu": self.refresh_leaderboard()
         
-        if name in animated_frames:
-            #Stops existing animation loop if running
-            if self.animation_id:
-                self.root.after_cancel(self.animation_id)
-                self.animation_id = None
-                
-            #Deletes old floating elements from the old canvas
-            if self.floating_elements:
-                canvas_to_delete_from = self.canvases.get(self.active_frame_name)
-                if canvas_to_delete_from:
-                    for element in self.floating_elements:
-                        canvas_to_delete_from.delete(element['id'])
-            self.floating_elements = []
-            
-            #Creates new elements on the active canvas
-            canvas = self.canvases.get(name)
-            if canvas:
-                # Store the active canvas name
-                self.active_frame_name = name 
-                # Re-create and store the floating elements for the current canvas
-                self.floating_elements = self._create_floating_elements(canvas)
-                
-            #Starts new animation loop
-            if self.floating_elements:
-                self.animation_id = self.root.after(50, self.animate_equations)
-                
-        else: #Quiz frame
-            if self.animation_id:
-                self.root.after_cancel(self.animation_id)
-                self.animation_id = None
-            #Clear elements from memory
-            if self.floating_elements:
-                canvas_to_delete_from = self.canvases.get(self.active_frame_name)
-                if canvas_to_delete_from:
-                    for element in self.floating_elements:
-                        canvas_to_delete_from.delete(element['id'])
-            self.floating_elements = []
+        #The equations only animate behind the animated pages; the clock stops on the Quiz page,
+        #which covers the whole canvas
+        if name in ANIMATED_PAGES:
+            if not self.background.sprites:
+                self._create_floating_elements(self.bg_canvas, self.background)
+            self.clock.resume(self.background)
+        else:
+            self.clock.pause(self.background)
 
 
     def _setup_animated_frame_base(self, frame_name, next_frame_name=None, back_frame_name=None):
-        #Sets up the canvas and content structure for Welcome/Instructions/Menu
-        frame = self.frames[frame_name]
-        # Frame layout must only contain the canvas
-        frame.grid_rowconfigure(0, weight=1); frame.grid_columnconfigure(0, weight=1)
-        
-        #Creates a full-size Canvas for floating elements
-        canvas = tk.Canvas(frame, bg="#E6F9E6", highlightthickness=0)
-        canvas.grid(row=0, column=0, sticky="nsew")
-        self.canvases[frame_name] = canvas
-        
-        #Creates the main content frame and place it in the center of the canvas
-        content = tk.Frame(canvas, bg="#E6F9E6")
-        self.center_windows[frame_name] = canvas.create_window(
-            200, 300, 
-            window=content, anchor="center"
-        )
-        
-        #Bind resize event to re-center the content
-        canvas.bind("<Configure>", lambda event, name=frame_name: self.recenter_content(event, name))
+        #The page frame itself is the content; show_frame centres it on the shared background canvas
+        content = self.frames[frame_name]
         
         if back_frame_name:
             font_name = self.n_font[0]
@@ -357,11 +298,29 @@ class MathQuizApp:
         content = self._setup_animated_frame_base("Menu", next_frame_name="Quiz", back_frame_name="Instructions")
                 
         tk.Label(content, text="🔢 Difficulty Level", font=self.h_font, bg="#E6F9E6").pack(pady=(0, 30))
-        levels = [("1. Easy (1-digit)", 1), ("2. Moderate (2-digit)", 2), ("3. Advanced (4-digit)", 3)]
+        levels = [("1. Easy (1-digit)", 1), ("2. Moderate (2-digit)", 2), ("3. Advanced (4-digit)", 3),
+                  ("4. Adaptive (auto)", ADAPTIVE_LEVEL)]
         for text, level in levels: 
             tk.Button(content, text=text, font=self.b_font, command=lambda l=level: self.start_quiz(l), 
                       bg="#FFC0CB", relief="raised", padx=20, pady=10).pack(pady=15, ipadx=20, fill='x')
 
+        #Adds ×, ÷, powers and multi-term +/- problems to the mix
+        self.extended_ops = tk.BooleanVar(self.root, value=False)
+        tk.Checkbutton(content, text="Extra operations (× ÷ ^ ±)", variable=self.extended_ops, font=self.t_font,
+                       bg="#E6F9E6", activebackground="#E6F9E6").pack(pady=(5, 0))
+
+        #Top scores across every quiz played on this machine
+        tk.Label(content, text="🏆 Top Scores", font=self.t_font, bg="#E6F9E6", fg="#004D00").pack(pady=(20, 0))
+        self.top_label = tk.Label(content, text="", font=(self.n_font[0], 14), bg="#E6F9E6", justify="left")
+        self.top_label.pack()
+
+    def refresh_leaderboard(self):
+        level_names = {1: "Easy", 2: "Moderate", 3: "Advanced", ADAPTIVE_LEVEL: "Adaptive"}
+        rows = self.leaderboard.top_k()
+        lines = [f"{i}. {score} pts  {level_names.get(level, level)}  {duration:.0f}s"
+                 for i, (score, level, duration, ts) in enumerate(rows, 1)]
+        self.top_label.config(text="\n".join(lines) or "No scores yet - be the first!")
+
     def create_quiz_page(self):
         font_name = self.n_font[0]
         frame = self.frames["Quiz"]
@@ -436,7 +395,13 @@ class MathQuizApp:
 
     def start_quiz(self, level):
         self.play_click_sound() #Play sound when starting quiz
+        if self.remote:
+            #The server decides the difficulty and the problem set for the whole class
+            try: level = self.remote.join()["difficulty"]
+            except OSError as e: return self.remote_failed(e)
         self.difficulty = level; self.score, self.q_count = 0, 0
+        self.session_id = uuid.uuid4().hex
+        self.quiz_start = time.perf_counter()
         self.r_count, self.w_count = 0, 0
         self.show_frame("Quiz"); self.present_problem()
     
@@ -444,10 +409,29 @@ class MathQuizApp:
         if self.timer_id: self.root.after_cancel(self.timer_id); self.timer_id = None
 
     def generate_problem(self):
-        self.n1, self.n2 = randomInt(self.difficulty); self.op = decideOperation()
-        if self.op == '-' and self.n2 > self.n1: self.n1, self.n2 = self.n2, self.n1
+        ops = EXTENDED_OPERATIONS if self.extended_ops.get() else BASIC_OPERATIONS
+        if self.remote:
+            #Thin client: the server hands out the shared problem set
+            self.problem = self.remote.next_problem()
+        elif self.difficulty == ADAPTIVE_LEVEL:
+            op = decideOperation(ops)
+            #O(1) pick from the pre-generated pool of the operation's current tier
+            self.problem = (binary_problem(*self.adaptive.next_problem(op)) if op in BASIC_OPERATIONS
+                            else make_problem(2, op))
+        else:
+            self.problem = createProblem(self.difficulty, ops)
+        self.n1, self.n2, self.op = self.problem.operands[0], self.problem.operands[-1], self.problem.op
         self.attempts = 0
-        self.ans_val = self.n1 + self.n2 if self.op == '+' else self.n1 - self.n2
+        self.ans_val = self.problem.answer
+
+    #Logs the outcome of the current question for difficulty tuning (see QuizAnalytics.py)
+    def record_result(self, correct, attempts):
+        response_ms = (time.perf_counter() - self.question_start) * 1000
+        if self.difficulty == ADAPTIVE_LEVEL:
+            self.adaptive.update(self.op, correct, attempts, response_ms / 1000)
+        self.results_log.record(self.session_id, self.difficulty, self.op, self.n1, self.n2,
+                                self.ans_val, attempts, correct, response_ms,
+                                format_terms(self.problem.operands, self.problem.ops))
 
     def update_timer(self):
         if self.time_left > 0:
@@ -459,22 +443,31 @@ class MathQuizApp:
             self.stop_timer_sound() #Stop the timer sound
             self.play_wrong_sound() 
             self.show_feedback('❌', 'red'); self.w_count += 1
+            self.record_result(False, self.attempts)
+            if self.remote:
+                try: self.remote.skip()
+                except OSError as e: return self.remote_failed(e)
             messagebox.showerror("Time's Up!", f"Out of time! Answer: {self.ans_val}.")
             self.present_problem()
 
     def present_problem(self):
         self.hide_feedback()
         self.end_timer()
-        if self.q_count >= 10: 
+        if self.q_count >= QUESTIONS_PER_QUIZ: 
             self.stop_timer_sound() #Stops the timer sound when quiz ends
             self.end_quiz(); 
             return
 
-        self.q_count += 1; self.generate_problem(); self.time_left = 20 #The timer in the quiz
-        self.q_label.config(text=f"Question {self.q_count} of 10")
-        self.n1_label.config(text=str(self.n1))
-        self.op_label.config(text=self.op)
-        self.n2_label.config(text=str(self.n2))
+        self.q_count += 1; self.time_left = 20 #The timer in the quiz
+        try: self.generate_problem()
+        except OSError as e: return self.remote_failed(e)
+        self.question_start = time.perf_counter()
+        self.q_label.config(text=f"Question {self.q_count} of {QUESTIONS_PER_QUIZ}")
+        #Multi-term problems show every term but the last on the top line
+        operands, ops = self.problem.operands, self.problem.ops
+        self.n1_label.config(text=format_terms(operands[:-1], ops[:-1]))
+        self.op_label.config(text=ops[-1])
+        self.n2_label.config(text=str(operands[-1]))
         self.clear_answer()
         self.s_label.config(text=f"Score: {self.score}")
         self.r_label.config(text=str(self.r_count)); self.w_label.config(text=str(self.w_count))
@@ -490,11 +483,21 @@ class MathQuizApp:
             messagebox.showerror("Error", "Enter an answer."); self.update_timer() 
             return
             
-        if isCorrect(user_input, self.n1, self.n2, self.op):
+        if self.remote:
+            #The server checks and scores the answer with the same rules
+            try: result = self.remote.answer(user_input)
+            except OSError as e: return self.remote_failed(e)
+            correct = result["correct"]
+        else:
+            correct = isCorrect(user_input, self.problem)
+
+        if correct:
             self.stop_timer_sound() # Stops the timer sound on correct answer
             self.play_correct_sound() 
-            points = 10 if self.attempts == 0 else 5; self.score += points
+            points = result["points"] if self.remote else awardPoints(self.attempts)
+            self.score = result["score"] if self.remote else self.score + points
             self.r_count += 1
+            self.record_result(True, self.attempts + 1)
             self.show_feedback('✅', 'green')
             messagebox.showinfo("Correct!", f"🎉 Correct! (+{points} pts)")
             self.present_problem() #This will call play_timer_sound() for the next question
@@ -503,19 +506,27 @@ class MathQuizApp:
             self.play_wrong_sound() 
             self.show_feedback('❌', 'red')
             self.attempts += 1
-            if self.attempts == 1: 
+            if self.attempts < MAX_ATTEMPTS: 
                 messagebox.showerror("Incorrect!", "❌ Incorrect. One more chance (+5 pts).")
                 self.clear_answer(); self.update_timer()
             else: 
                 self.stop_timer_sound() #Stop sound before moving to next question (after the 2nd wrong attempt)
                 self.w_count += 1
+                self.record_result(False, self.attempts)
                 messagebox.showerror("Wrong Again!", f"💔 Incorrect. Answer: {self.ans_val}.")
                 self.present_problem()
                 
+    def remote_failed(self, error):
+        self.end_timer(); self.stop_timer_sound()
+        messagebox.showerror("Connection Error", f"Lost connection to the quiz server: {error}")
+        self.score, self.q_count, self.difficulty, self.r_count, self.w_count = 0, 0, 0, 0, 0
+        self.show_frame("Menu")
+
     def end_quiz(self):
         self.end_timer()
         self.stop_timer_sound() #Stops timer sound at the end of the quiz
         rank = displayResults(self.score)
+        self.leaderboard.add(self.score, self.difficulty, time.perf_counter() - self.quiz_start)
         if messagebox.askyesno("Quiz Finished!", f"🏆 Quiz Complete!\nScore: {self.score}/100.\nRank: {rank}\n\nPlay another?"): 
             self.score, self.q_count, self.difficulty, self.r_count, self.w_count = 0, 0, 0, 0, 0
             self.show_frame("Menu")
@@ -523,6 +534,13 @@ class MathQuizApp:
 
 #The Main Execution
 if __name__ == "__main__":
+    import sys
+    remote = None
+    if len(sys.argv) == 3 and sys.argv[1] == "--connect":
+        #Thin client mode: python MathQuiz.py --connect HOST:PORT
+        from QuizServer import QuizClient
+        host, port = sys.argv[2].rsplit(":", 1)
+        remote = QuizClient(host, int(port))
     root = tk.Tk()
-    app = MathQuizApp(root)
+    app = MathQuizApp(root, remote)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,227 @@
+#Parallel loader for very large marks files (same text format as studentMarks.txt).
+#The file is split into newline-aligned byte ranges; each range is parsed in a process-pool
+#worker into compact column buffers, and the buffers are merged in file order. Results and
+#messages (skipped lines, header-count warning) are identical to the sequential loader.
+#Compressed files (.gz/.xz/.bz2) cannot be split by byte offset; they are parsed in chunks
+#straight off the decompression stream instead (load_columns_stream).
+#Usage: python ParallelLoader.py benchmark [rows] [--workers 1,2,4,8]
+import locale
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from StudentRepository import Student, read_student_file, PARALLEL_LOAD_BYTES
+from MarksCodecs import is_compressed, open_marks
+
+RANGES_PER_WORKER = 4 #More ranges than workers evens out the load
+STREAM_CHUNK_CHARS = 1024 * 1024 #Text decoded per step when streaming a compressed file
+#Skipped-line kinds and the messages the sequential loader prints for them
+SKIP_MESSAGES = {
+    "format": "Skipping line due to incorrect format: {}",
+    "invalid_mark": "Skipping line due to invalid mark data: {}",
+}
+
+
+def split_ranges(path, parts):
+    """Splits the file into at most 'parts' byte ranges that each end just after a newline."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            target = max(size * i // parts, bounds[-1])
+            f.seek(target)
+            f.readline() #Skip to the start of the next line
+            pos = f.tell()
+            if pos >= size: break
+            if pos > bounds[-1]: bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _column(values):
+    #Marks normally fit in a machine integer; int() accepts arbitrarily large numbers though
+    try: return array('q', values)
+    except OverflowError: return values
+
+
+def parse_range(task):
+    """Worker: parses one byte range into column buffers plus its skipped lines, in order.
+    Line numbers are relative to the range; the caller adds the range's first line number."""
+    path, start, end, encoding, has_header = task
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    #Same line splitting as text mode with universal newlines
+    lines = data.decode(encoding).replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    if lines and lines[-1] == '': lines.pop()
+    return parse_lines(lines, has_header)
+
+
+def parse_lines(lines, has_header):
+    """Parses decoded lines (without line endings); see parse_range for the result."""
+    line_count = len(lines)
+    header = lines[0] if has_header and lines else None
+
+    numbers, names, c1, c2, c3, exam, line_numbers, skipped = [], [], [], [], [], [], array('q'), []
+    for index in range(1 if header is not None else 0, line_count):
+        line = lines[index]
+        parts = [p.strip() for p in line.split(',')]
+        if len(parts) == 6:
+            try:
+                marks = int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])
+            except ValueError:
+                skipped.append((index, "invalid_mark", line.strip()))
+                continue
+            numbers.append(parts[0]); names.append(parts[1]); line_numbers.append(index)
+            c1.append(marks[0]); c2.append(marks[1]); c3.append(marks[2]); exam.append(marks[3])
+        else:
+            skipped.append((index, "format", line.strip()))
+    #One string per text column pickles far faster than a list of small strings
+    return (header, line_count, "\n".join(numbers), "\n".join(names), len(numbers),
+            _column(c1), _column(c2), _column(c3), _column(exam), line_numbers, skipped)
+
+
+class StudentColumns:
+    """Students stored column-wise: numbers, names and the four marks in file order."""
+    def __init__(self):
+        self.numbers, self.names = [], []
+        self.course1, self.course2, self.course3, self.exam_mark = array('q'), array('q'), array('q'), array('q')
+        self.lines = array('q') #1-based file line of each record
+        self.skipped = [] #(line, kind, text) for every line that was not loaded
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def extend(self, first_line, numbers, names, count, c1, c2, c3, exam, line_numbers, skipped):
+        self.lines.extend(first_line + n for n in line_numbers)
+        self.skipped.extend((first_line + n, kind, text) for n, kind, text in skipped)
+        if count:
+            self.numbers.extend(numbers.split("\n")); self.names.extend(names.split("\n"))
+        for field, values in (("course1", c1), ("course2", c2), ("course3", c3), ("exam_mark", exam)):
+            column = getattr(self, field)
+            if isinstance(column, array) and not isinstance(values, array):
+                column = list(column); setattr(self, field, column) #Huge marks: switch to a plain list
+            column.extend(values)
+
+    def students(self):
+        return [Student(*row) for row in zip(self.numbers, self.names, self.course1, self.course2,
+                                             self.course3, self.exam_mark)]
+
+
+def load_columns(path, workers=None, encoding=None, echo=True):
+    """Parses the file in parallel. Returns (columns, expected count); raises OSError or ValueError.
+    Skip messages are printed like the sequential loader unless echo is False."""
+    if is_compressed(path):
+        return load_columns_stream(path, encoding, echo)
+    workers = workers or os.cpu_count() or 1
+    encoding = encoding or locale.getpreferredencoding(False)
+    size = os.path.getsize(path)
+    if size == 0:
+        raise ValueError("File is empty.")
+    #The first range also carries the header line, which is split off like any other line
+    ranges = [(path, start, end, encoding, i == 0)
+              for i, (start, end) in enumerate(split_ranges(path, workers * RANGES_PER_WORKER))]
+
+    if workers == 1 or size < PARALLEL_LOAD_BYTES: #Not worth starting processes
+        results = map(parse_range, ranges)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_range, ranges))
+
+    results = iter(results)
+    first = next(results)
+    #The first line is expected to be the total number of students (checked before any output)
+    num_students = int(first[0].strip())
+    columns = StudentColumns()
+    first_line = 1
+    for header, line_count, *buffers, skipped in (first, *results):
+        if echo:
+            for _, kind, text in skipped:
+                print(SKIP_MESSAGES[kind].format(text))
+        columns.extend(first_line, *buffers, skipped)
+        first_line += line_count
+    return columns, num_students
+
+
+def load_columns_stream(path, encoding=None, echo=True, chunk_chars=STREAM_CHUNK_CHARS):
+    """Sequential version of load_columns for compressed files: decompresses and parses one chunk
+    at a time, so memory holds the columns plus a single chunk, never the whole text."""
+    encoding = encoding or locale.getpreferredencoding(False)
+    columns, num_students, first_line, carry = StudentColumns(), None, 1, ""
+    with open_marks(path, "r", encoding=encoding) as stream:
+        while True:
+            chunk = stream.read(chunk_chars)
+            if chunk:
+                lines = (carry + chunk).split("\n")
+                carry = lines.pop() #Partial last line, completed by the next chunk
+            else:
+                lines = [carry] if carry else [] #Last line without a newline
+            if lines:
+                header, line_count, *buffers, skipped = parse_lines(lines, num_students is None)
+                if num_students is None:
+                    num_students = int(header.strip()) #Checked before any output, as in load_columns
+                if echo:
+                    for _, kind, text in skipped:
+                        print(SKIP_MESSAGES[kind].format(text))
+                columns.extend(first_line, *buffers, skipped)
+                first_line += line_count
+            if not chunk:
+                break
+    if num_students is None:
+        raise ValueError("File is empty.")
+    return columns, num_students
+
+
+def read_student_file_parallel(path, workers=None):
+    """Drop-in parallel version of read_student_file: returns (students, expected count)."""
+    columns, num_students = load_columns(path, workers)
+    return columns.students(), num_students
+
+
+def write_sample(path, rows, bad_every=100_000):
+    """Synthetic marks file with a few malformed lines and a wrong header count."""
+    import random
+    rng = random.Random(7)
+    with open(path, 'w') as f:
+        f.write(f"{rows + 1}\n")
+        for i in range(rows):
+            if i % bad_every == 1: f.write(f"{i}, Broken Row, x, 1, 2, 3\n"); continue
+            if i % bad_every == 2: f.write("just text\n"); continue
+            f.write(f"{100000 + i}, Student {i}, {rng.randint(0, 20)}, {rng.randint(0, 20)}, "
+                    f"{rng.randint(0, 20)}, {rng.randint(0, 100)}\n")
+
+
+def benchmark(rows=2_000_000, worker_counts=(1, 2, 4, 8)):
+    import contextlib, io, tempfile
+    path = os.path.join(tempfile.gettempdir(), f"marks_benchmark_{rows}.txt")
+    if not os.path.exists(path): write_sample(path, rows)
+    print(f"{path}: {os.path.getsize(path) / 1e6:.0f} MB, {os.cpu_count()} CPUs")
+
+    def timed(load):
+        out = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(out):
+            result = load()
+        return time.perf_counter() - start, result, out.getvalue()
+
+    seq_time, (students, expected), seq_messages = timed(lambda: read_student_file(path, parallel=False))
+    print(f"{'sequential':>12}: {seq_time:6.2f} s")
+    reference = [s.to_file_format() for s in students]
+    for workers in worker_counts:
+        col_time, (columns, count), messages = timed(lambda: load_columns(path, workers))
+        obj_time = time.perf_counter(); parallel_students = columns.students(); obj_time = time.perf_counter() - obj_time
+        same = (count == expected and messages == seq_messages
+                and [s.to_file_format() for s in parallel_students] == reference)
+        print(f"{workers:>4} workers: {col_time:6.2f} s to columns ({seq_time / col_time:4.1f}x), "
+              f"+{obj_time:.2f} s to Student objects  {'identical' if same else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    if argv[:1] != ["benchmark"]:
+        print("Usage: python ParallelLoader.py benchmark [rows] [--workers 1,2,4,8]"); sys.exit(1)
+    counts = (1, 2, 4, 8)
+    if "--workers" in argv:
+        i = argv.index("--workers"); counts = tuple(int(n) for n in argv[i + 1].split(",")); del argv[i:i + 2]
+    benchmark(int(argv[1]) if len(argv) > 1 else 2_000_000, counts)
@@ -0,0 +1,203 @@
+#Per-question results log for MathQuiz, stored in a local SQLite file.
+#Rows are queued by the UI and written in batches by a background thread.
+#n1 and n2 are the first and last operands; 'terms' holds the whole question as shown
+#(e.g. '12 + 7 - 3'), so multi-term rows keep every operand. Older files gain the column
+#(NULL for their rows) the first time they are opened.
+#Usage:
+#   python QuizAnalytics.py report [--by difficulty|operation|magnitude|attempts] [--db FILE]
+#   python QuizAnalytics.py generate N [--db FILE]      (synthetic rows for testing)
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+RESULTS_DB = "quiz_results.db"
+BATCH_SIZE = 500 #Rows written per transaction
+FLUSH_SECONDS = 1.0 #Maximum time a row waits in the queue
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    ts          REAL    NOT NULL,
+    session     TEXT    NOT NULL,
+    difficulty  INTEGER NOT NULL,
+    op          TEXT    NOT NULL,
+    n1          INTEGER NOT NULL,
+    n2          INTEGER NOT NULL,
+    answer      INTEGER NOT NULL,
+    attempts    INTEGER NOT NULL,
+    correct     INTEGER NOT NULL,
+    response_ms INTEGER NOT NULL,
+    terms       TEXT
+);
+"""
+INSERT = "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+#Grouping expressions for the report command
+REPORTS = {
+    "difficulty": "difficulty",
+    "operation": "op",
+    #Digits of the largest operand; multi-term rows look at every term, not just n1 and n2
+    "magnitude": "length(CAST(CASE WHEN op = '±' AND terms IS NOT NULL THEN largest_operand(terms) "
+                 "ELSE max(abs(n1), abs(n2)) END AS TEXT))",
+    "attempts": "attempts",
+}
+
+
+def open_database(path, schema):
+    """Opens a SQLite file in WAL mode so readers never block the writer (or other processes)."""
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    return conn
+
+
+def largest_operand(terms):
+    """Largest absolute operand in '12 + 7 - 3' style question text."""
+    return max(abs(int(value)) for value in terms.split()[::2])
+
+
+def upgrade(conn):
+    """Adds the terms column to a results table created before it existed."""
+    if "terms" not in {row[1] for row in conn.execute("PRAGMA table_info(results)")}:
+        conn.execute("ALTER TABLE results ADD COLUMN terms TEXT")
+    conn.create_function("largest_operand", 1, largest_operand, deterministic=True)
+
+
+def connect(path=RESULTS_DB):
+    conn = open_database(path, SCHEMA)
+    upgrade(conn)
+    return conn
+
+
+class BatchWriter:
+    """Background thread that inserts queued rows in batches. put() never touches the disk."""
+    def __init__(self, path, schema, insert, batch_size=BATCH_SIZE, on_commit=None, upgrade=None):
+        self.path = path
+        self.schema = schema
+        self.upgrade = upgrade #Called with the connection after opening (schema migrations)
+        self.insert = insert
+        self.batch_size = batch_size
+        self.on_commit = on_commit #Called as on_commit(batch, ok) after each batch is written or fails (on the writer thread)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+
+    def put(self, row):
+        self.queue.put(row)
+
+    def close(self):
+        """Flushes the remaining rows and stops the writer thread."""
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+    def _writer(self):
+        try:
+            conn = open_database(self.path, self.schema)
+            if self.upgrade: self.upgrade(conn)
+        except sqlite3.Error as e:
+            print(f"Could not open '{self.path}': {e}")
+            conn = None #Keep draining the queue so every batch is still reported as failed
+        batch = []
+        running = True
+        while running:
+            try:
+                item = self.queue.get(timeout=FLUSH_SECONDS)
+                if item is None:
+                    running = False
+                else:
+                    batch.append(item)
+                    if len(batch) < self.batch_size: continue
+            except queue.Empty:
+                pass
+            if batch:
+                ok = False
+                if conn is not None:
+                    try:
+                        with conn: #One transaction per batch; the busy timeout waits out other writers
+                            conn.executemany(self.insert, batch)
+                        ok = True
+                    except sqlite3.Error as e:
+                        print(f"Could not write {len(batch)} rows to '{self.path}': {e}")
+                if self.on_commit:
+                    try:
+                        self.on_commit(batch, ok)
+                    except Exception as e: #A failing callback must not stop the writer
+                        print(f"Commit callback for '{self.path}' failed: {e}")
+                batch = []
+        if conn is not None:
+            conn.close()
+
+
+class ResultsLog:
+    """Append-only, batched results log. record() never touches the disk on the caller's thread."""
+    def __init__(self, path=RESULTS_DB):
+        self.path = path
+        self.writer = BatchWriter(path, SCHEMA, INSERT, upgrade=upgrade)
+
+    def record(self, session, difficulty, op, n1, n2, answer, attempts, correct, response_ms, terms=None):
+        self.writer.put((time.time(), session, difficulty, op, n1, n2, answer,
+                         attempts, int(correct), int(response_ms), terms))
+
+    def close(self):
+        """Flushes the remaining rows and stops the writer thread."""
+        self.writer.close()
+
+
+def report(by="difficulty", path=RESULTS_DB):
+    """Returns rows of (group, questions, accuracy %, first-try %, mean response ms)."""
+    group = REPORTS[by]
+    conn = connect(path)
+    try:
+        return conn.execute(f"""
+            SELECT {group} AS grp, COUNT(*), 100.0 * AVG(correct),
+                   100.0 * AVG(correct AND attempts = 1), AVG(response_ms)
+            FROM results GROUP BY grp ORDER BY grp""").fetchall()
+    finally:
+        conn.close()
+
+
+def generate(count, path=RESULTS_DB):
+    """Inserts synthetic rows so reporting speed can be checked on millions of rows."""
+    import random
+    conn = connect(path)
+    now = time.time()
+    ranges = {1: (1, 9), 2: (10, 99), 3: (1000, 9999)}
+    def rows():
+        for i in range(count):
+            d = random.randint(1, 3); lo, hi = ranges[d]
+            n1, n2 = random.randint(lo, hi), random.randint(lo, hi)
+            op = random.choice('+-')
+            correct = random.random() < 0.9 - 0.15 * d
+            yield (now + i, f"synthetic-{i // 10}", d, op, n1, n2, n1 + n2 if op == '+' else n1 - n2,
+                   1 if correct else 2, int(correct), random.randint(800, 20000), f"{n1} {op} {n2}")
+    with conn:
+        conn.executemany(INSERT, rows())
+    conn.close()
+
+
+def main(argv):
+    path = RESULTS_DB
+    if "--db" in argv:
+        i = argv.index("--db"); path = argv[i + 1]; del argv[i:i + 2]
+    if argv[:1] == ["generate"] and len(argv) == 2:
+        start = time.perf_counter(); generate(int(argv[1]), path)
+        print(f"Inserted {int(argv[1])} rows in {time.perf_counter() - start:.2f} s")
+    elif argv[:1] == ["report"]:
+        by = argv[argv.index("--by") + 1] if "--by" in argv else "difficulty"
+        if by not in REPORTS:
+            print(f"Unknown report '{by}'. Choose from: {', '.join(REPORTS)}"); return 1
+        start = time.perf_counter(); rows = report(by, path); elapsed = time.perf_counter() - start
+        print(f"{by:>12}{'questions':>12}{'accuracy %':>12}{'first try %':>13}{'mean ms':>10}")
+        for grp, count, acc, first, ms in rows:
+            print(f"{grp!s:>12}{count:>12}{acc:>12.1f}{first:>13.1f}{ms:>10.0f}")
+        print(f"({sum(r[1] for r in rows)} rows aggregated in {elapsed * 1000:.0f} ms)")
+    else:
+        print("Usage: python QuizAnalytics.py report [--by difficulty|operation|magnitude|attempts] | generate N")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,232 @@
+#Classroom server for MathQuiz: every connected client answers the same problem set.
+#Uses the quiz rules from MathQuiz (createProblem, isCorrect, awardPoints, displayResults)
+#over a local TCP socket with one JSON message per line, served by asyncio on one thread.
+#Usage:
+#   python QuizServer.py serve [--host 127.0.0.1] [--port 8765] [--difficulty 1-3] [--seed N]
+#   python QuizServer.py loadtest [--clients 300] [--rounds 3] [--host H --port P | --local]
+#   python MathQuiz.py --connect 127.0.0.1:8765     (thin Tk client)
+#
+#Client -> server:  {"type": "join", "name": ...}  {"type": "next"}
+#                   {"type": "answer", "answer": "42"}  {"type": "skip"}
+#Server -> client:  welcome {difficulty, questions}   problem {q, operands, ops}
+#                   result {correct, points, score, final, answer}   done {score, rank}
+#                   error {message}
+import asyncio
+import json
+import random
+import socket
+import sys
+import time
+from MathQuiz import QUESTIONS_PER_QUIZ, MAX_ATTEMPTS, createProblem, isCorrect, awardPoints, displayResults
+from Problems import BASIC_OPERATIONS, EXTENDED_OPERATIONS, evaluate, problem_from_terms
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CLIENT_TIMEOUT = 5.0 #Seconds the thin client waits for a reply
+
+
+class Player:
+    """Progress of one connection through the shared problem set."""
+    __slots__ = ("name", "q", "attempts", "score")
+
+    def __init__(self, name):
+        self.name = name
+        self.q = 0 #Index of the current question
+        self.attempts = 0
+        self.score = 0
+
+
+class QuizServer:
+    def __init__(self, difficulty=1, seed=None, ops=BASIC_OPERATIONS, verbose=True):
+        self.difficulty = difficulty
+        self.verbose = verbose
+        self.players = 0
+        self.requests = 0
+        #One problem set for the whole session, so every client gets the same questions
+        state = random.getstate()
+        random.seed(seed)
+        self.problems = [createProblem(difficulty, ops) for _ in range(QUESTIONS_PER_QUIZ)]
+        random.setstate(state)
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle_client, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def handle(self, player, message):
+        """Applies one client message and returns the reply (pure, no I/O)."""
+        kind = message.get("type")
+        if kind == "join":
+            player.name = str(message.get("name") or player.name)
+            player.q, player.attempts, player.score = 0, 0, 0
+            return {"type": "welcome", "difficulty": self.difficulty, "questions": len(self.problems)}
+        if player.q >= len(self.problems):
+            return {"type": "done", "score": player.score, "rank": displayResults(player.score)}
+        problem = self.problems[player.q]
+        if kind == "next":
+            return {"type": "problem", "q": player.q + 1, "operands": problem.operands, "ops": problem.ops}
+        if kind == "answer" or kind == "skip":
+            correct = kind == "answer" and isCorrect(str(message.get("answer", "")), problem)
+            points = awardPoints(player.attempts) if correct else 0
+            player.score += points
+            player.attempts += 1
+            final = correct or kind == "skip" or player.attempts >= MAX_ATTEMPTS
+            if final: player.q, player.attempts = player.q + 1, 0
+            reply = {"type": "result", "correct": correct, "points": points, "score": player.score, "final": final}
+            if final and not correct: reply["answer"] = problem.answer
+            if final and self.verbose and player.q == len(self.problems):
+                print(f"{player.name} finished with {player.score} points ({displayResults(player.score)})")
+            return reply
+        return {"type": "error", "message": f"Unknown message type: {kind!r}"}
+
+    async def handle_client(self, reader, writer):
+        self.players += 1
+        player = Player(f"player-{self.players}")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try:
+                    reply = self.handle(player, json.loads(line))
+                except (ValueError, AttributeError) as e:
+                    reply = {"type": "error", "message": f"Bad message: {e}"}
+                self.requests += 1
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class QuizClient:
+    """Blocking client used by the Tk thin client. Network errors surface as OSError."""
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=CLIENT_TIMEOUT):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.sock = None
+        self.file = None
+
+    def request(self, message):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, timeout=self.timeout)
+            self.file = self.sock.makefile("rb")
+        try:
+            self.sock.sendall(json.dumps(message).encode() + b"\n")
+            line = self.file.readline()
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError("server closed the connection")
+        reply = json.loads(line)
+        if reply.get("type") == "error":
+            raise ConnectionError(reply.get("message"))
+        return reply
+
+    def join(self, name=None):
+        return self.request({"type": "join", "name": name or socket.gethostname()})
+
+    def next_problem(self):
+        reply = self.request({"type": "next"})
+        if reply["type"] != "problem":
+            raise ConnectionError("no questions left on the server")
+        return problem_from_terms(reply["operands"], reply["ops"])
+
+    def answer(self, text):
+        return self.request({"type": "answer", "answer": text})
+
+    def skip(self):
+        return self.request({"type": "skip"})
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = self.file = None
+
+
+async def simulated_player(host, port, rounds, latencies, rng):
+    """One load-test client: plays 'rounds' full quizzes, answering about 80% correctly."""
+    reader, writer = await asyncio.open_connection(host, port)
+    async def request(message):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        return reply
+    try:
+        for _ in range(rounds):
+            await request({"type": "join", "name": "load"})
+            while True:
+                reply = await request({"type": "next"})
+                if reply["type"] != "problem": break
+                answer = evaluate(reply["operands"], reply["ops"])
+                while True:
+                    wrong = rng.random() < 0.2
+                    reply = await request({"type": "answer", "answer": str(answer + 1 if wrong else answer)})
+                    if reply["final"]: break
+    finally:
+        writer.close()
+
+
+async def load_test(clients, rounds, host=DEFAULT_HOST, port=DEFAULT_PORT, local=False):
+    server = None
+    if local:
+        server = QuizServer(verbose=False)
+        port = await server.start(host, 0)
+    latencies = []
+    rng = random.Random(1)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(simulated_player(host, port, rounds, latencies, rng) for _ in range(clients)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    if server is not None: await server.close()
+
+    failed = [r for r in results if isinstance(r, BaseException)]
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+    print(f"{clients} clients x {rounds} quizzes: {len(latencies)} requests in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:,.0f} req/s), {len(failed)} failed clients")
+    print(f"latency ms: p50 {pct(0.50):.2f}  p95 {pct(0.95):.2f}  p99 {pct(0.99):.2f}  max {pct(1.0):.2f}")
+    if failed: print(f"first failure: {failed[0]!r}")
+    return 1 if failed else 0
+
+
+def option(argv, name, default, cast=str):
+    return cast(argv[argv.index(name) + 1]) if name in argv else default
+
+
+async def serve(host, port, difficulty, seed, ops):
+    server = QuizServer(difficulty, seed, ops)
+    port = await server.start(host, port)
+    print(f"Quiz server on {host}:{port} (difficulty {difficulty}, {len(server.problems)} questions)")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main(argv):
+    host = option(argv, "--host", DEFAULT_HOST)
+    port = option(argv, "--port", DEFAULT_PORT, int)
+    if argv[:1] == ["serve"]:
+        ops = EXTENDED_OPERATIONS if "--extended" in argv else BASIC_OPERATIONS
+        try:
+            asyncio.run(serve(host, port, option(argv, "--difficulty", 1, int), option(argv, "--seed", None, int), ops))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if argv[:1] == ["loadtest"]:
+        return asyncio.run(load_test(option(argv, "--clients", 300, int), option(argv, "--rounds", 3, int),
+                                     host, port, local="--local" in argv))
+    print("Usage: python QuizServer.py serve [--port N --difficulty D --seed S --extended] | "
+          "loadtest [--clients N --rounds R] [--local]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,7 +3,13 @@ from tkinter import messagebox
 import tkinter.font as font
 import random
 import os
-import pygame
+import time
+import threading
+from AudioManager import AudioManager, PRIORITY_LOW, PRIORITY_HIGH
+from SpriteScheduler import FrameClock
+from EmojiPhysics import EmojiField
+from SpriteCache import get_sprite
+from JokeStore import JokeStore
 
 #colors used
 COLOR_BACKGROUND = "#0F0F0F"   
@@ -16,55 +22,26 @@ COLOR_WHITE = "#FFFFFF"
 #CUSTOM FONT
 CUSTOM_FONT_FAMILY = "Rampart One" 
 
-class Emoji:  
-    def __init__(self, canvas, image, x, y, speed_x, speed_y):
-        self.canvas = canvas
-        self.image = image
-        self.id = self.canvas.create_image(x, y, image=self.image, anchor=tk.CENTER)
-        self.speed_x = speed_x
-        self.speed_y = speed_y
-        self.size = 50 
-
-    def move(self):
-        self.canvas.move(self.id, self.speed_x, self.speed_y)
-        x, y = self.canvas.coords(self.id)
-
-        #Get canvas dimensions
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-
-        #Check bounds using coordinates and size
-        if x + self.size/2 >= canvas_width or x - self.size/2 <= 0:
-            self.speed_x *= -1
-        if y + self.size/2 >= canvas_height or y - self.size/2 <= 0:
-            self.speed_y *= -1
+#How often the jokes file is checked for changes (ms)
+JOKES_WATCH_MS = 2000
+
+#Emoji animation settings
+EMOJI_SIZE = 50 #Used for bounds checking
+EMOJI_COLLISIONS = False #Set to True to let emojis bounce off each other
 
 class JokeApp:
     def __init__(self, master):
         self.master = master
         master.title("Daily Dose of LOLs - Electric Neon")
         
-        #Audio setup
-        self.sound_enabled = False
-        self.music_enabled = False
+        #Audio setup (mixer start and decoding run in the background; silent if unavailable)
         self.bg_music_file = 'jokesbg.mp3'
-        
-        try:
-            pygame.mixer.init()
-            self.click_sound = pygame.mixer.Sound('clicks.mp3')
-            self.laugh_sound = pygame.mixer.Sound('laugh.mp3')
-            self.sound_enabled = True
-
-            if os.path.exists(self.bg_music_file):
-                pygame.mixer.music.load(self.bg_music_file)
-                self.music_enabled = True
-                self.play_background_music()
-            
-        except pygame.error as e:
-            messagebox.showwarning("Audio Warning",
-                                   "Could not load all audio files. Audio features disabled.")
-            self.sound_enabled = False
-            self.music_enabled = False
+        self.audio = AudioManager()
+        self.audio.register('click', 'clicks.mp3', priority=PRIORITY_LOW, coalesce_ms=30)
+        self.audio.register('laugh', 'laugh.mp3', priority=PRIORITY_HIGH)
+        if os.path.exists(self.bg_music_file):
+            self.audio.set_music(self.bg_music_file, volume=1.0)
+        self.audio.start()
         
         #Custom font
         custom_font_file = 'RampartOne-Regular.ttf'
@@ -103,39 +80,46 @@ class JokeApp:
         self.welcome_frame = tk.Frame(master, bg=COLOR_BACKGROUND)
         self.joke_frame = tk.Frame(master, bg=COLOR_BACKGROUND)
 
-        self.emojis = []
+        self.clock = FrameClock(master)
         self.emoji_photos = [] 
         self.emoji_image_paths = ['laughing_emoji_1.png', 'laughing_emoji_2.png', 'laughing_emoji_3.png']
 
+        #The joke page (canvas, emojis, status line) is only built on its first visit
         self.create_welcome_page()
-        self.create_joke_page()
+        self.joke_page_built = False
+        self.emojis = None
+        self.reload_label = None
 
         self.show_frame(self.welcome_frame)
         
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+        #Hot-reload: poll the jokes file's mtime and re-index changes in the background
+        self.reload_thread = None
+        self.pending_update = None
+        self.watch_job = None
+        self.watch_jokes_file()
+
     #Audio Methods
     def on_closing(self):
-        if self.music_enabled:
-            pygame.mixer.music.stop()
+        if self.watch_job:
+            self.master.after_cancel(self.watch_job)
+        self.clock.close()
+        self.audio.shutdown()
         self.master.destroy()
 
-    def play_background_music(self):
-        if self.music_enabled:
-            pygame.mixer.music.play(-1)
-
     def play_click(self):
-        if self.sound_enabled:
-            self.click_sound.play()
+        self.audio.play('click')
 
     def play_laugh(self):
-        if self.sound_enabled:
-            self.laugh_sound.play()
+        self.audio.play('laugh')
             
     #Frame Control
     def show_frame(self, frame):
         self.welcome_frame.pack_forget()
         self.joke_frame.pack_forget()
+        if frame == self.joke_frame and not self.joke_page_built:
+            self.create_joke_page(); self.joke_page_built = True
         frame.pack(fill=tk.BOTH, expand=True)
         
         if frame == self.joke_frame:
@@ -210,6 +194,9 @@ class JokeApp:
         #Main content area as a Canvas 
         self.content_canvas = tk.Canvas(self.joke_frame, bg=COLOR_BACKGROUND, highlightthickness=0)
         self.content_canvas.pack(fill=tk.BOTH, expand=True)
+        #Emoji sprites; the group pauses itself whenever the joke page is hidden
+        self.emojis = self.clock.add_group(EmojiField(self.content_canvas, size=EMOJI_SIZE, collide=EMOJI_COLLISIONS),
+                                           pause_when_hidden=True)
 
         #Label for the joke text
         self.joke_text_label = tk.Label(self.content_canvas, text="",
@@ -244,11 +231,15 @@ class JokeApp:
                                              width=15)
         self.next_joke_button.pack(padx=10)
 
+        #Jokes file status (count and last reload time)
+        self.reload_label = tk.Label(self.content_canvas, text=self.jokes_status_text(),
+                                     font=(CUSTOM_FONT_FAMILY, 10), fg=COLOR_PRIMARY, bg=COLOR_BACKGROUND)
+        self.reload_label.place(relx=0.5, rely=0.98, anchor=tk.S)
+
     #Emoji method. (took assistance from AI)
     def setup_emojis(self):
-        self.emojis = []
+        self.emojis.clear()
         self.emoji_photos = [] 
-        self.content_canvas.delete("all") 
 
         canvas_width = self.content_canvas.winfo_width()
         canvas_height = self.content_canvas.winfo_height()
@@ -262,12 +253,8 @@ class JokeApp:
         for path in self.emoji_image_paths:
             if os.path.exists(path):
                 try:
-                    original_photo = tk.PhotoImage(file=path)
-                    
-                    subsample_x = max(1, original_photo.width() // target_size)
-                    subsample_y = max(1, original_photo.height() // target_size)
-                    
-                    resized_image = original_photo.subsample(subsample_x, subsample_y)
+                    #Decoded once per process; later visits reuse the cached image
+                    resized_image = get_sprite(path, target_size, master=self.master)
                     self.emoji_photos.append(resized_image) 
 
                     for _ in range(num_duplicates_per_emoji):
@@ -276,76 +263,98 @@ class JokeApp:
                         speed_x = random.choice([-1.5, -1, 1, 1.5]) 
                         speed_y = random.choice([-1.5, -1, 1, 1.5])
                         
-                        self.emojis.append(Emoji(self.content_canvas, resized_image, x, y, speed_x, speed_y))
+                        item = self.content_canvas.create_image(x, y, image=resized_image, anchor=tk.CENTER)
+                        self.emojis.add(item, x, y, speed_x, speed_y)
                     
-                except tk.TclError as e:
+                except (tk.TclError, OSError) as e:
                     print(f"Error loading image {path}: {e}")
             else:
                 print(f"Warning: Emoji image file not found: {path}")
 
-    def animate_emojis(self):
-        for emoji in self.emojis:
-            emoji.move()
-        self.animation_job = self.master.after(50, self.animate_emojis) 
-
     def start_emoji_animation(self):
-        if not self.emojis: 
+        if not len(self.emojis): 
             self.master.after(100, lambda: self._start_animation_after_setup())
         else:
-            if hasattr(self, 'animation_job'):
-                self.master.after_cancel(self.animation_job)
-            self.animate_emojis()
+            self.clock.resume(self.emojis)
             
     def _start_animation_after_setup(self):
         self.setup_emojis()
-        if self.emojis:
-            self.animate_emojis()
+        if len(self.emojis):
+            self.clock.resume(self.emojis)
 
     def stop_emoji_animation(self):
-        if hasattr(self, 'animation_job'):
-            self.master.after_cancel(self.animation_job)
-            del self.animation_job 
-        
-        for emoji in self.emojis:
-            self.content_canvas.delete(emoji.id) 
-        self.emojis = [] 
+        if self.emojis is None: return #Joke page not built yet
+        self.clock.pause(self.emojis)
+        self.emojis.clear()
         self.emoji_photos = [] 
 
     #Joke logic
     def load_jokes(self):
+        """Opens the indexed joke store; only byte offsets are kept in memory."""
         try:
             if not os.path.exists(self.file_path):
                 messagebox.showerror("File Error",
                                      f"Joke file not found: '{self.file_path}'. Please ensure it exists.")
-                return []
+                return None
                 
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            jokes_list = []
-            for line in lines:
-                line = line.strip()
-                if line:
-                    parts = line.split('?', 1) 
-                    if len(parts) == 2:
-                        setup = parts[0].strip()
-                        punchline = parts[1].strip()
-                        jokes_list.append((setup, punchline))
+            store = JokeStore(self.file_path)
                         
-            if not jokes_list:
+            if not len(store):
                      messagebox.showwarning("No Jokes",
                                             f"The file '{self.file_path}' was read but contains no jokes in the expected format.")
                                             
-            return jokes_list
+            return store
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred while loading jokes from the file: {e}")
-            return []
+            return None
+
+    def jokes_status_text(self, update=None):
+        count = len(self.jokes) if self.jokes is not None else 0
+        if update is None:
+            return f"{count} jokes loaded"
+        return (f"{count} jokes ({update.added():+d}) - reloaded at {time.strftime('%H:%M:%S')} "
+                f"in {update.seconds * 1000:.1f} ms")
+
+    #Jokes file watcher
+    def watch_jokes_file(self):
+        #The stat is cheap; re-indexing runs on a worker thread so the UI never blocks
+        #An empty store is still watched, so jokes added to an empty file are picked up
+        if self.jokes is not None and self.reload_thread is None and self.jokes.has_changed():
+            self.reload_thread = threading.Thread(target=self._reindex_jokes, daemon=True)
+            self.reload_thread.start()
+        if self.reload_thread is not None and not self.reload_thread.is_alive():
+            self.reload_thread = None
+            self._apply_jokes_update()
+        self.watch_job = self.master.after(JOKES_WATCH_MS if self.reload_thread is None else 100,
+                                           self.watch_jokes_file)
+
+    def _reindex_jokes(self):
+        #Worker thread: only touches files, never Tk widgets
+        start = time.perf_counter()
+        try:
+            update = self.jokes.compute_update()
+            update.seconds = time.perf_counter() - start
+            self.pending_update = update
+        except OSError as e:
+            print(f"Could not reload jokes: {e}")
+
+    def _apply_jokes_update(self):
+        update, self.pending_update = self.pending_update, None
+        if update is None: return
+        self.jokes.apply_update(update)
+        if self.reload_label is not None:
+            self.reload_label.config(text=self.jokes_status_text(update))
 
     def get_random_joke(self):
-        if self.jokes:
-            self.current_joke = random.choice(self.jokes)
-            return True
+        #Shuffled no-repeat order: every joke is shown once before any repeats
+        #(next_joke returns None while the store is empty)
+        if self.jokes is not None:
+            try:
+                self.current_joke = self.jokes.next_joke()
+            except OSError:
+                self.current_joke = None
+            return self.current_joke is not None
         return False
         
     def show_setup_with_click(self):
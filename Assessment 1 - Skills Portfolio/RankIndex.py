@@ -0,0 +1,61 @@
+#Order-statistic index over overall totals (0-160) for class rank and percentile lookups.
+#A Fenwick (binary indexed) tree keeps one counter per possible total, so adding, removing
+#and counting "students above X" each take O(log 161) steps regardless of class size.
+
+MAX_TOTAL = 160 #60 coursework + 100 exam
+
+
+class TotalsIndex:
+    """Counts of students per overall total, with prefix sums in a Fenwick tree."""
+    def __init__(self, totals=()):
+        self.tree = [0] * (MAX_TOTAL + 2) #1-based: slot t + 1 holds total t
+        self.size = 0
+        for total in totals:
+            self.add(total)
+
+    @staticmethod
+    def _slot(total):
+        #Totals from out-of-range marks are clamped so they still rank at the ends
+        return min(max(int(total), 0), MAX_TOTAL) + 1
+
+    def _update(self, total, delta):
+        i = self._slot(total)
+        tree = self.tree
+        while i <= MAX_TOTAL + 1:
+            tree[i] += delta
+            i += i & -i
+        self.size += delta
+
+    def add(self, total):
+        self._update(total, 1)
+
+    def remove(self, total):
+        self._update(total, -1)
+
+    def replace(self, old_total, new_total):
+        if old_total != new_total:
+            self.remove(old_total); self.add(new_total)
+
+    def count_at_or_below(self, total):
+        """Number of students whose total is <= 'total'."""
+        if total < 0: return 0
+        i, count, tree = self._slot(total), 0, self.tree
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def count_above(self, total):
+        """Number of students who scored strictly more than 'total'."""
+        return self.size - self.count_at_or_below(total)
+
+    def rank(self, total):
+        """Class position (1 = best); equal totals share a rank."""
+        return self.count_above(total) + 1
+
+    def percentile(self, total):
+        """Percentage of the class scoring at or below 'total'."""
+        return 100 * self.count_at_or_below(total) / self.size if self.size else 0.0
+
+    def __len__(self):
+        return self.size
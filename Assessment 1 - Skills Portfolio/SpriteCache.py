@@ -0,0 +1,62 @@
+#Process-wide cache of decoded and downscaled sprite images.
+#Each PNG is decoded once per (path, target size, mtime); optionally a small
+#pre-scaled thumbnail is written to disk so later launches skip the full decode.
+import os
+import tkinter as tk
+
+THUMBNAIL_DIR = ".sprite_cache"
+
+_cache = {} #(absolute path, target size, mtime) -> PhotoImage
+
+
+def _cache_key(path, target_size):
+    path = os.path.abspath(path)
+    return path, target_size, os.stat(path).st_mtime_ns
+
+
+def _thumbnail_path(key):
+    path, target_size, mtime = key
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(THUMBNAIL_DIR, f"{name}_{target_size}_{mtime}.png")
+
+
+def get_sprite(path, target_size, master=None, write_thumbnail=True):
+    """Returns a PhotoImage of 'path' subsampled to roughly target_size pixels.
+
+    Raises OSError if the file does not exist and tk.TclError if it cannot be decoded.
+    """
+    key = _cache_key(path, target_size)
+    image = _cache.get(key)
+    if image is not None:
+        return image
+
+    thumb = _thumbnail_path(key)
+    if os.path.exists(thumb):
+        try:
+            image = tk.PhotoImage(master=master, file=thumb)
+        except tk.TclError:
+            image = None #Corrupt thumbnail, fall back to the original file
+
+    if image is None:
+        original = tk.PhotoImage(master=master, file=path)
+        subsample_x = max(1, original.width() // target_size)
+        subsample_y = max(1, original.height() // target_size)
+        image = original.subsample(subsample_x, subsample_y)
+        if write_thumbnail:
+            _write_thumbnail(image, thumb)
+
+    _cache[key] = image
+    return image
+
+
+def _write_thumbnail(image, thumb):
+    try:
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        image.write(thumb, format="png")
+    except (OSError, tk.TclError):
+        pass #Thumbnails are only an optimisation
+
+
+def clear_cache():
+    """Drops every cached image (e.g. before the Tk root is destroyed)."""
+    _cache.clear()
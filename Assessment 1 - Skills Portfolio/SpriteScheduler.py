@@ -0,0 +1,144 @@
+#Shared animation scheduler used by MathQuiz and RandomJokes.
+#One FrameClock drives every SpriteGroup of an app from a single 'after' loop,
+#and the loop stops completely when no group is visible.
+from FrameStats import FrameStats
+
+FRAME_MS = 50 #Requested interval between frames (20 fps)
+
+
+class Sprite:
+    """A single moving canvas item. __slots__ keeps each record small."""
+    __slots__ = ("item", "x", "y", "dx", "dy", "margin")
+
+    def __init__(self, item, x, y, dx, dy, margin):
+        self.item = item
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.margin = margin
+
+
+class SpriteGroup:
+    """All the sprites that live on one canvas. Stepped by a FrameClock while active."""
+    def __init__(self, canvas, margin=20):
+        self.canvas = canvas
+        self.margin = margin
+        self.sprites = []
+        self.active = False
+        self.bounds = None #(w, h) set by the owner after a resize; saves two Tcl calls per frame
+
+    def add(self, item, x, y, dx, dy, margin=None):
+        sprite = Sprite(item, x, y, dx, dy, self.margin if margin is None else margin)
+        self.sprites.append(sprite)
+        return sprite
+
+    def clear(self):
+        """Deletes every sprite item from the canvas and forgets the records."""
+        for sprite in self.sprites:
+            try: self.canvas.delete(sprite.item)
+            except Exception: pass #Canvas may already be destroyed on close
+        self.sprites = []
+
+    def set_bounds(self, w, h):
+        self.bounds = (w, h)
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def step(self):
+        """Moves every sprite one frame and bounces it off the canvas edges."""
+        canvas = self.canvas
+        w, h = self.bounds or (canvas.winfo_width(), canvas.winfo_height())
+        if w <= 1 or h <= 1: return
+
+        #Positions are tracked in Python so each sprite costs one Tcl call per frame
+        for sprite in self.sprites:
+            new_x = sprite.x + sprite.dx
+            new_y = sprite.y + sprite.dy
+            m = sprite.margin
+
+            if new_x < m or new_x > w - m:
+                sprite.dx *= -1
+                new_x = sprite.x + sprite.dx
+            if new_y < m or new_y > h - m:
+                sprite.dy *= -1
+                new_y = sprite.y + sprite.dy
+
+            sprite.x, sprite.y = new_x, new_y
+            canvas.coords(sprite.item, new_x, new_y)
+
+
+class FrameClock:
+    """Single frame clock for an app. Only runs while at least one group is active."""
+    def __init__(self, root, interval=FRAME_MS, stats=None):
+        self.root = root
+        self.interval = interval
+        self.groups = []
+        self.job = None
+        #Frame-time instrumentation, only when asked for (see FrameStats.py)
+        self.stats = stats if stats is not None else FrameStats.from_environment(interval)
+
+    def add_group(self, group, pause_when_hidden=False):
+        """Registers a group. Optionally pauses it automatically when its canvas is unmapped."""
+        if group not in self.groups:
+            self.groups.append(group)
+            if self.stats: self.stats.attach(group)
+        if pause_when_hidden:
+            group.canvas.bind("<Map>", lambda event: self.resume(group), add="+")
+            group.canvas.bind("<Unmap>", lambda event: self.pause(group), add="+")
+        return group
+
+    def remove_group(self, group):
+        self.pause(group)
+        if group in self.groups:
+            self.groups.remove(group)
+
+    def resume(self, group):
+        group.active = True
+        self._ensure_running()
+
+    def pause(self, group):
+        group.active = False
+        if not any(g.active for g in self.groups):
+            self.stop()
+
+    def pause_all(self):
+        for group in self.groups:
+            group.active = False
+        self.stop()
+
+    def close(self):
+        """Stops the clock for good and writes the frame trace if one was requested."""
+        self.pause_all()
+        if self.stats:
+            try: self.stats.export()
+            except OSError as e: print(f"Could not write frame trace: {e}")
+
+    def stop(self):
+        if self.job is not None:
+            try: self.root.after_cancel(self.job)
+            except Exception: pass
+            self.job = None
+
+    def _ensure_running(self):
+        if self.job is None:
+            self.job = self.root.after(self.interval, self._tick)
+            if self.stats: self.stats.scheduled()
+
+    def _tick(self):
+        self.job = None
+        stats = self.stats
+        if stats: stats.frame_start()
+        running = None
+        for group in self.groups:
+            if group.active and len(group):
+                if running is None: running = group
+                try: group.step()
+                except Exception: pass #Items can vanish during a quick close/switch
+        #Re-schedule only while there is something to draw, so an idle app costs no CPU
+        if running:
+            self.job = self.root.after(self.interval, self._tick)
+            if stats:
+                stats.scheduled()
+                stats.frame_end(running.canvas) #Overlay goes on the first visible group's canvas
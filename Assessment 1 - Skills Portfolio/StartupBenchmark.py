@@ -0,0 +1,76 @@
+#Startup benchmark for the three apps.
+#Each app is measured in a fresh Python process so module imports are not cached.
+#Reports: import time, time to first paint, and time until a first interaction is handled.
+#Usage: python StartupBenchmark.py [runs]     (needs a display)
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.dirname(HERE) #Sounds, images and data files live in the repository root
+
+#name -> (module, app class, first interaction)
+APPS = {
+    "MathQuiz": ("MathQuiz", "MathQuizApp", lambda app: app.show_frame("Instructions")),
+    "RandomJokes": ("RandomJokes", "JokeApp", lambda app: app.show_frame(app.joke_frame)),
+    "StudentMarks": ("StudentMarksExtension", "StudentManagerApp", lambda app: app.view_all_records()),
+}
+
+
+def measure(name):
+    """Runs inside the child process and returns the timings in milliseconds."""
+    module_name, class_name, interact = APPS[name]
+    start = time.perf_counter()
+    import tkinter as tk
+    module = importlib.import_module(module_name)
+    imported = time.perf_counter()
+
+    root = tk.Tk()
+    app = getattr(module, class_name)(root)
+    root.wait_visibility()
+    root.update()
+    painted = time.perf_counter()
+
+    interact(app)
+    root.update()
+    interacted = time.perf_counter()
+
+    root.destroy()
+    return {
+        "app": name,
+        "import_ms": (imported - start) * 1000,
+        "first_paint_ms": (painted - start) * 1000,
+        "first_interaction_ms": (interacted - painted) * 1000,
+    }
+
+
+def run_child(name):
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name],
+                            cwd=ASSET_DIR, env=env, capture_output=True, text=True, timeout=60)
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"{name} failed:\n{result.stderr.strip()}")
+
+
+def main(runs=3):
+    print(f"{'App':<14}{'import':>10}{'first paint':>14}{'first input':>14}   (ms, best of {runs})")
+    for name in APPS:
+        try:
+            results = [run_child(name) for _ in range(runs)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"{name:<14}  error: {e}")
+            continue
+        best = {key: min(r[key] for r in results) for key in ("import_ms", "first_paint_ms", "first_interaction_ms")}
+        print(f"{name:<14}{best['import_ms']:>10.1f}{best['first_paint_ms']:>14.1f}{best['first_interaction_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(measure(sys.argv[2])))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -4,13 +4,8 @@ from tkinter import simpledialog
 from tkinter import scrolledtext
 from tkinter import font as tkFont
 
-# Attempt to import Pygame for audio, handling potential import errors
-try:
-    import pygame
-    pygame_available = True
-except ImportError:
-    pygame_available = False
-    print("Warning: Pygame not installed. Audio features will be disabled.")
+#Shared audio manager (imports pygame lazily and falls back to silence without it)
+from AudioManager import AudioManager, PRIORITY_LOW
 
 
 #Data Structure for Student Records
@@ -130,35 +125,19 @@ class StudentManagerApp:
         self.button_font = tkFont.Font(family="Helvetica Neue", size=12, weight="bold") 
         self.body_font = tkFont.Font(family="Fira Code", size=11)
         
-        #Audio Setup (Pygame Mixer)
-        self.is_playing_audio = False
-        self.click_sound = None 
-        if pygame_available:
-            try:
-                #Initialize mixer for sound playback
-                pygame.mixer.init(44100, -16, 2, 2048)
-                
-                #Load background music
-                pygame.mixer.music.load('studentbg.mp3')
-                pygame.mixer.music.play(-1) # -1 makes it loop indefinitely
-                
-                #Load click sound effect
-                self.click_sound = pygame.mixer.Sound('studentclick.mp3')
-
-                self.is_playing_audio = True
-                print("Background music started.")
-            except pygame.error as e:
-                print(f"Pygame audio error (file missing or mixer failed): {e}")
-                messagebox.showwarning("Audio Warning", "Could not start background music or load sound effects. Ensure 'studentbg.mp3' and 'studentclick.mp3' are in the application directory.")
-                self.is_playing_audio = False
+        #Audio Setup (mixer start and sound decoding happen in the background)
+        self.audio = AudioManager(44100, -16, 2, 2048)
+        self.audio.set_music('studentbg.mp3', volume=1.0)
+        #Every mouse click plays this, so bursts are merged into one playback
+        self.audio.register('click', 'studentclick.mp3', priority=PRIORITY_LOW, coalesce_ms=30)
+        self.audio.start()
         
         #Set up protocol handler for graceful exit (stops music)
         master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         #Bind mouse click for sound effect
-        if self.is_playing_audio and self.click_sound:
-            #Binds the left mouse button click across the entire window (master)
-            master.bind('<Button-1>', self.play_click_sound) 
+        #Binds the left mouse button click across the entire window (master)
+        master.bind('<Button-1>', self.play_click_sound) 
 
         #Load data
         self.students, self.num_students = load_student_data()
@@ -273,16 +252,15 @@ class StudentManagerApp:
     #Graceful Exit Handler (Stops audio)
     def on_closing(self):
         """Stops background music and destroys the window."""
-        if self.is_playing_audio:
-            pygame.mixer.music.stop()
+        self.audio.shutdown()
         self.master.destroy()
 
     #Mouse Click Sound Player
     def play_click_sound(self, event):
         """Plays the click sound effect when the mouse button is pressed."""
-        if self.click_sound:
-            if event.widget != self.output_area:
-                self.click_sound.play()
+        #Ignore clicks in the output area so selecting text does not spam sounds
+        if event.widget != self.output_area:
+            self.audio.play('click')
 
     #Helper Methods
     def _clear_output(self, title):
@@ -427,10 +405,3 @@ if __name__ == '__main__':
     root = tk.Tk()
     app = StudentManagerApp(root)
     root.mainloop()
-
-    #Quit pygame mixer after Tkinter window closes
-    if pygame_available:
-        try:
-            pygame.quit()
-        except Exception:
-            pass #Ignore if mixer wasn't initialized
\ No newline at end of file
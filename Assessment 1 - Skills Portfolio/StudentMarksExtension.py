@@ -4,109 +4,55 @@ from tkinter import simpledialog
 from tkinter import scrolledtext
 from tkinter import font as tkFont
 from functools import cmp_to_key
-
-#Attempt to import Pygame for audio, handling potential import errors
-try:
-    import pygame
-    pygame_available = True
-except ImportError:
-    pygame_available = False
-    print("Warning: Pygame not installed. Audio features will be disabled.")
-
-
-#Data Structure for Student Records
-class Student:
-    """Represents a single student's record and calculated results."""
-    def __init__(self, student_number, name, course1, course2, course3, exam_mark):
-        self.student_number = str(student_number)
-        self.name = name
-        #Coursework marks (C1, C2, C3) and Exam mark are stored here.
-        self.course1 = int(course1)
-        self.course2 = int(course2)
-        self.course3 = int(course3)
-        self.exam_mark = int(exam_mark)
-
-    def get_coursework_total(self):
-        """Calculates the total coursework mark (max 60)."""
-        return self.course1 + self.course2 + self.course3
-
-    def get_overall_total(self):
-        """Calculates the overall total mark (max 160 = 60 CW + 100 Exam)."""
-        return self.get_coursework_total() + self.exam_mark
-
-    def get_percentage(self):
-        """Calculates the overall percentage based on 160 total marks."""
-        return (self.get_overall_total() / 160) * 100
-
-    def get_grade(self):
-        """Determines the student's grade based on percentage (as per specs)."""
-        percent = self.get_percentage()
-        if percent >= 70:
-            return 'A'
-        elif percent >= 60:
-            return 'B'
-        elif percent >= 50:
-            return 'C'
-        elif percent >= 40:
-            return 'D'
-        else:
-            return 'F'
-
-    def get_formatted_record(self):
-        """Returns a string with the full formatted record for display."""
-        return (
-            f"  Name: {self.name}\n"
-            f"  Number: {self.student_number}\n"
-            f"  Total Coursework: {self.get_coursework_total():<3} / 60\n"
-            f"  Exam Mark: {self.exam_mark:<3} / 100\n"
-            f"  Overall Percentage: {self.get_percentage():<6.2f}%\n"
-            f"  Student Grade: {self.get_grade()}\n"
-            f"{'=' * 35}"
-        )
-        
-    def to_file_format(self):
-        """Returns the record in the comma-separated format used in the file."""
-        return f"{self.student_number}, {self.name}, {self.course1}, {self.course2}, {self.course3}, {self.exam_mark}"
+from itertools import islice
+import sqlite3
+import sys
+import time
+
+#Student records and the text/SQLite storage backends
+from StudentRepository import (Student, TextFileRepository, SQLiteRepository, SORT_KEYS, STUDENTS_FILE,
+                               GRADE_BOUNDARIES, write_student_file)
+from StudentQuery import StudentQuery #Range/grade filters answered from an index
+from MarksAnalytics import CohortAnalytics
+from GradingSchemes import GradingScheme, CohortHistogram, STANDARD, load_schemes, save_scheme
+from MarksChart import GradeChart
+from ParallelLoader import load_columns #Column-wise parser (parallel for large files)
+from MarksValidation import validate_columns
+
+#Shared audio manager (imports pygame lazily and falls back to silence without it)
+from AudioManager import AudioManager, PRIORITY_LOW
+
+RECORDS_PER_PAGE = 100 #Filter results are added a page at a time as the output is scrolled
+#Filter panel rows: query field -> label (each row has inclusive From/To boxes)
+FILTER_FIELDS = (
+    ("percentage", "Percentage"),
+    ("exam", "Exam Mark (0-100)"),
+    ("coursework", "Coursework (0-60)"),
+    ("total", "Overall Total (0-160)"),
+)
 
 #Data Loading Function
-def load_student_data(filename='studentMarks.txt'):
+def load_student_data(filename=STUDENTS_FILE):
     """
     Loads student data from the specified file into a list of Student objects.
+    Files ending in .gz, .xz or .bz2 are decompressed as they are parsed.
     """
-    student_list = []
-    num_students = 0
     try:
-        with open(filename, 'r') as file:
-            lines = file.readlines()
-            if not lines:
-                raise ValueError("File is empty.")
-            #The first line is expected to be the total number of students
-            num_students = int(lines[0].strip())
-            for line in lines[1:]:
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) == 6:
-                    student_number = parts[0]
-                    name = parts[1]
-                    try:
-                        # Convert marks to integers
-                        course1 = int(parts[2])
-                        course2 = int(parts[3])
-                        course3 = int(parts[4])
-                        exam_mark = int(parts[5])
-                        student_list.append(Student(student_number, name, course1, course2, course3, exam_mark))
-                    except ValueError:
-                        print(f"Skipping line due to invalid mark data: {line.strip()}")
-                else:
-                    print(f"Skipping line due to incorrect format: {line.strip()}")
+        columns, num_students = load_columns(filename)
+        student_list = columns.students()
         if len(student_list) != num_students:
               print(f"Warning: Expected {num_students} students, but loaded {len(student_list)}.")
+        #Range, duplicate and name checks over the loaded columns, reported in one dialog
+        report = validate_columns(columns, num_students, filename)
+        if not report.ok:
+            print(report.summary(limit=50))
+            messagebox.showwarning("Data Validation", report.summary())
         return student_list, len(student_list)
     except FileNotFoundError:
         messagebox.showerror("File Error", f"The file '{filename}' was not found. Creating empty file structure.")
         #Create an empty file structure if not found
         try:
-            with open(filename, 'w') as file:
-                file.write("0\n")
+            write_student_file(filename, []) #Compressed too if the name asks for it
             return [], 0
         except Exception as e:
             messagebox.showerror("File Creation Error", f"Could not create file '{filename}': {e}")
@@ -122,22 +68,17 @@ def load_student_data(filename='studentMarks.txt'):
 class StudentManagerApp:
     
     #Data Persistence Method
-    def save_student_data(self, filename='studentMarks.txt'):
-        """Writes the current list of student records back to the file."""
+    def _commit(self, edit, *args, **changes):
+        """Runs one repository edit (saved straight away). Shows the error and returns False on failure."""
         try:
-            with open(filename, 'w') as file:
-                #Write the total number of students first
-                file.write(f"{len(self.students)}\n")
-                #Write each student record in the correct comma-separated format
-                for student in self.students:
-                    file.write(f"{student.to_file_format()}\n")
+            edit(*args, **changes)
             return True
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Failed to save data to file: {e}")
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Save Error", f"Failed to save data: {e}")
             return False
 
     #Initialization
-    def __init__(self, master):
+    def __init__(self, master, repository=None, filename=STUDENTS_FILE):
         self.master = master
         master.title("Student Manager Dashboard")
         master.geometry("1000x800") #Increased size for new buttons
@@ -162,31 +103,23 @@ class StudentManagerApp:
         self.button_font = tkFont.Font(family="Helvetica Neue", size=12, weight="bold") 
         self.body_font = tkFont.Font(family="Fira Code", size=11)
         
-        #Audio Setup (Pygame Mixer)
-        self.is_playing_audio = False
-        self.click_sound = None 
-        if pygame_available:
-            try:
-                pygame.mixer.init(44100, -16, 2, 2048)
-                pygame.mixer.music.load('studentbg.mp3')
-                pygame.mixer.music.play(-1) 
-                self.click_sound = pygame.mixer.Sound('studentclick.mp3')
-                self.is_playing_audio = True
-                print("Background music started.")
-            except pygame.error as e:
-                print(f"Pygame audio error: {e}")
-                messagebox.showwarning("Audio Warning", "Could not start audio. Check MP3 files.")
-                self.is_playing_audio = False
+        #Audio Setup (mixer start and sound decoding happen in the background)
+        self.audio = AudioManager(44100, -16, 2, 2048)
+        self.audio.set_music('studentbg.mp3', volume=1.0)
+        #Every mouse click plays this, so bursts are merged into one playback
+        self.audio.register('click', 'studentclick.mp3', priority=PRIORITY_LOW, coalesce_ms=30)
+        self.audio.start()
         
         master.protocol("WM_DELETE_WINDOW", self.on_closing)
-        if self.is_playing_audio and self.click_sound:
-            master.bind('<Button-1>', self.play_click_sound) 
+        master.bind('<Button-1>', self.play_click_sound) 
 
-        #Load data
-        self.students, self.num_students = load_student_data()
-        if not self.students:
-            self.students = []
-            self.num_students = 0
+        #Load data: the text file by default, or the SQLite repository given on the command line
+        if repository is None:
+            students, _ = load_student_data(filename)
+            repository = TextFileRepository(students or [], filename)
+        self.repo = repository
+        #Edits move single students between the histogram cells and chart bars
+        self.repo.listeners.append(self._on_marks_changed)
 
         #GUI Layout (Grid System)
         
@@ -250,19 +183,43 @@ class StudentManagerApp:
         self.btn_sort = create_action_button("5. Sort Student Records 🔄", self.sort_student_records, self.view_button_color)
         self.btn_sort.pack(fill=tk.X, pady=5)
 
+        #Filter Student Records
+        self.btn_filter = create_action_button("6. Filter Records 🔎", self.filter_student_records, self.view_button_color)
+        self.btn_filter.pack(fill=tk.X, pady=5)
+        self.filter_window = None
+
+        #Per-component analytics (cached until a mark changes)
+        self.btn_analytics = create_action_button("7. Cohort Analytics 📈", self.show_analytics, self.view_button_color)
+        self.btn_analytics.pack(fill=tk.X, pady=5)
+        self.analytics = None
+        self.analytics_version = None
+
+        #What-if re-grading with adjustable boundaries and weights
+        self.btn_what_if = create_action_button("8. What-if Grading 🎚️", self.show_what_if, self.view_button_color)
+        self.btn_what_if.pack(fill=tk.X, pady=5)
+        self.what_if_window = None
+        self.grade_histogram = None
+        self.histogram_version = None
+
+        #Grade distribution chart (histogram and box plot)
+        self.btn_chart = create_action_button("9. Grade Distribution 📶", self.show_grade_chart, self.view_button_color)
+        self.btn_chart.pack(fill=tk.X, pady=5)
+        self.chart_window = None
+        self.chart = None
+
         tk.Frame(self.action_frame, height=2, bg=self.primary_bg).pack(fill=tk.X, pady=10) # Separator
 
         #Modification Actions (Orange/Yellow)
         #Add New Student
-        self.btn_add = create_action_button("6. Add New Student ➕", self.add_student_record, self.modify_button_color)
+        self.btn_add = create_action_button("10. Add New Student ➕", self.add_student_record, self.modify_button_color)
         self.btn_add.pack(fill=tk.X, pady=5)
 
         #Update Student Record
-        self.btn_update = create_action_button("7. Update Student Record ✏️", self.update_student_record, self.modify_button_color)
+        self.btn_update = create_action_button("11. Update Student Record ✏️", self.update_student_record, self.modify_button_color)
         self.btn_update.pack(fill=tk.X, pady=5)
         
         #Delete Student Record
-        self.btn_delete = create_action_button("8. Delete Student Record 🗑️", self.delete_student_record, self.modify_button_color)
+        self.btn_delete = create_action_button("12. Delete Student Record 🗑️", self.delete_student_record, self.modify_button_color)
         self.btn_delete.pack(fill=tk.X, pady=5)
 
         tk.Frame(self.action_frame, height=2, bg=self.primary_bg).pack(fill=tk.X, pady=10) # Separator
@@ -279,10 +236,13 @@ class StudentManagerApp:
                                                      bd=5, relief=tk.SUNKEN)
         #Place output area on the right side
         self.output_area.grid(row=0, column=1, sticky="nswe")
+        #Scrolling near the end of a long filter result adds the next page of records
+        self.pending_records = None
+        self.output_area.config(yscrollcommand=self._on_output_scroll)
         
         #Initial Welcome Message
         self.output_area.insert(tk.END, f"Welcome to the Student Manager!\n\n")
-        self.output_area.insert(tk.END, f"Loaded {self.num_students} student records.\n")
+        self.output_area.insert(tk.END, f"Loaded {self.repo.count()} student records.\n")
         self.output_area.insert(tk.END, f"Use the **Action Center** on the left to manage records.\n")
         self.output_area.config(state=tk.DISABLED)
         
@@ -294,20 +254,21 @@ class StudentManagerApp:
     #Graceful Exit Handler (Stops audio)
     def on_closing(self):
         """Stops background music and destroys the window."""
-        if self.is_playing_audio:
-            pygame.mixer.music.stop()
+        self.audio.shutdown()
+        self.repo.close()
         self.master.destroy()
 
     #Mouse Click Sound Player
     def play_click_sound(self, event):
         """Plays the click sound effect when the mouse button is pressed."""
-        if self.click_sound:
-            if event.widget != self.output_area:
-                self.click_sound.play()
+        #Ignore clicks in the output area so selecting text does not spam sounds
+        if event.widget != self.output_area:
+            self.audio.play('click')
 
     #Helper Methods
     def _clear_output(self, title):
         """Clears the output area and prints a title with enhanced styling."""
+        self.pending_records = None
         self.output_area.config(state=tk.NORMAL)
         self.output_area.delete(1.0, tk.END)
         
@@ -317,39 +278,46 @@ class StudentManagerApp:
         self.output_area.config(state=tk.DISABLED)
         self.status_bar.config(text=f"Action: {title}")
     
-    def _find_student(self, search_term):
-        """Helper to find a student by exact number or name prefix."""
-        found_students = []
-        is_exact_number_match = False
-        
-        #Check for Exact Student Number Match (Takes priority)
-        for student in self.students:
-            if student.student_number.lower() == search_term:
-                return [student] 
-        
-        #If no exact number match, perform Alphabetic/Prefix search
-        for student in self.students:
-            if student.name.lower().startswith(search_term):
-                found_students.append(student)
+    def _format_record(self, student):
+        """Formatted record including the student's class rank (O(log N) from the rank index)."""
+        return student.get_formatted_record(self.repo.rank_of(student))
 
-        #Sort matches alphabetically by name if multiple results exist
-        if len(found_students) > 1:
-            found_students.sort(key=lambda s: s.name.lower())
-            
-        return found_students
+    def _show_records(self, students):
+        """Inserts the first page of records; the rest follow as the output is scrolled down."""
+        self.pending_records = iter(students)
+        self._insert_next_page()
+
+    def _insert_next_page(self):
+        if self.pending_records is None:
+            return
+        page = list(islice(self.pending_records, RECORDS_PER_PAGE))
+        if len(page) < RECORDS_PER_PAGE:
+            self.pending_records = None
+        self.output_area.config(state=tk.NORMAL)
+        self.output_area.insert(tk.END, "".join(self._format_record(s) + "\n\n" for s in page))
+        self.output_area.config(state=tk.DISABLED)
+
+    def _on_output_scroll(self, first, last):
+        self.output_area.vbar.set(first, last)
+        if self.pending_records is not None and float(last) > 0.9:
+            self.output_area.after_idle(self._insert_next_page)
+
+    def _find_student(self, search_term):
+        """Helper to find a student by exact number (takes priority) or name prefix, sorted by name."""
+        return self.repo.find(search_term)
 
 
     def _display_summary(self):
         """Calculates and displays the summary information with enhanced styling."""
-        if not self.students:
+        num_students = self.repo.count()
+        if not num_students:
             return
 
-        total_percentage_sum = sum(s.get_percentage() for s in self.students)
-        average_percentage = total_percentage_sum / self.num_students
+        average_percentage = self.repo.average_percentage()
 
         summary = (
             f"\n\n{'=' * 10} CLASS SUMMARY {'=' * 10}\n"
-            f"  Number of Students: {self.num_students}\n"
+            f"  Number of Students: {num_students}\n"
             f"  Average Percentage: {average_percentage:.2f}%\n"
             f"{'=' * 35}"
         )
@@ -360,7 +328,7 @@ class StudentManagerApp:
 
     #View/SEARCH Actions
     def view_all_records(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data available to display.")
             self.status_bar.config(text="Status: No data loaded.")
             return
@@ -368,15 +336,15 @@ class StudentManagerApp:
         self._clear_output("All Student Records")
         self.output_area.config(state=tk.NORMAL)
 
-        for student in self.students:
-            self.output_area.insert(tk.END, student.get_formatted_record() + "\n\n")
+        for student in self.repo.all():
+            self.output_area.insert(tk.END, self._format_record(student) + "\n\n")
         
         self._display_summary()
         self.output_area.config(state=tk.DISABLED)
         self.status_bar.config(text="Status: Displayed all student records.")
 
     def view_individual_record(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data available.")
             self.status_bar.config(text="Status: No data loaded.")
             return
@@ -402,7 +370,7 @@ class StudentManagerApp:
             self.output_area.tag_config("match_header", font=self.header_font, foreground=self.accent_color)
             
             for student in found_students:
-                self.output_area.insert(tk.END, student.get_formatted_record() + "\n\n")
+                self.output_area.insert(tk.END, self._format_record(student) + "\n\n")
 
             self.status_bar.config(text=f"Status: Found {len(found_students)} record(s) for '{search_term}'.")
         else:
@@ -413,40 +381,38 @@ class StudentManagerApp:
         self.output_area.config(state=tk.DISABLED)
 
     def show_highest_score(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data available.")
             self.status_bar.config(text="Status: No data loaded.")
             return
 
-        #Uses the max() function and a lambda key to find the student object 
-        #with the highest value returned by get_overall_total().
-        highest_scorer = max(self.students, key=lambda s: s.get_overall_total())
+        #Student with the highest overall total (an index lookup with the SQLite backend)
+        highest_scorer = self.repo.highest()
 
         self._clear_output("Student with Highest Overall Score")
         self.output_area.config(state=tk.NORMAL)
-        self.output_area.insert(tk.END, highest_scorer.get_formatted_record())
+        self.output_area.insert(tk.END, self._format_record(highest_scorer))
         self.output_area.config(state=tk.DISABLED)
         self.status_bar.config(text=f"Status: Displayed highest scorer: {highest_scorer.name}.")
 
     def show_lowest_score(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data available.")
             self.status_bar.config(text="Status: No data loaded.")
             return
 
-        #Uses the min() function and a lambda key to find the student object 
-        #with the lowest value returned by get_overall_total().
-        lowest_scorer = min(self.students, key=lambda s: s.get_overall_total())
+        #Student with the lowest overall total (an index lookup with the SQLite backend)
+        lowest_scorer = self.repo.lowest()
 
         self._clear_output("Student with Lowest Overall Score")
         self.output_area.config(state=tk.NORMAL)
-        self.output_area.insert(tk.END, lowest_scorer.get_formatted_record())
+        self.output_area.insert(tk.END, self._format_record(lowest_scorer))
         self.output_area.config(state=tk.DISABLED)
         self.status_bar.config(text=f"Status: Displayed lowest scorer: {lowest_scorer.name}.")
         
     #Sort student records
     def sort_student_records(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data available to sort.")
             return
 
@@ -466,36 +432,282 @@ class StudentManagerApp:
                                              parent=self.master).strip().upper()
 
         reverse = (order_input == 'D')
-        sort_key = None
-        sort_title = ""
-
-        if key_input == 'N':
-            sort_key = lambda s: s.name.lower()
-            sort_title = "Alphabetical Order by Name"
-        elif key_input == 'T':
-            sort_key = lambda s: s.get_overall_total()
-            sort_title = "Overall Total Score"
-        elif key_input == 'P':
-            sort_key = lambda s: s.get_percentage()
-            sort_title = "Overall Percentage"
-        else:
+
+        if key_input not in SORT_KEYS:
             messagebox.showerror("Error", "Invalid sort key selected.")
             self.status_bar.config(text="Status: Sort failed (Invalid key).")
             return
+        sort_title = SORT_KEYS[key_input][0]
 
-        #Perform the sort
-        self.students.sort(key=sort_key, reverse=reverse)
+        #Perform the sort (ORDER BY on an index with the SQLite backend)
+        students = self.repo.ordered(key_input, reverse)
         
         self._clear_output(f"Sorted Records by {sort_title} ({'Descending' if reverse else 'Ascending'})")
         self.output_area.config(state=tk.NORMAL)
         
-        for student in self.students:
-            self.output_area.insert(tk.END, student.get_formatted_record() + "\n\n")
+        for student in students:
+            self.output_area.insert(tk.END, self._format_record(student) + "\n\n")
         
         self._display_summary()
         self.output_area.config(state=tk.DISABLED)
         self.status_bar.config(text=f"Status: Records sorted by {sort_title}.")
 
+    #Filter student records
+    def filter_student_records(self):
+        if not self.repo.count():
+            messagebox.showinfo("Info", "No student data available to filter.")
+            return
+        if self.filter_window is not None and self.filter_window.winfo_exists():
+            self.filter_window.lift()
+            return
+
+        window = self.filter_window = tk.Toplevel(self.master, bg=self.action_panel_bg, padx=15, pady=15)
+        window.title("Filter Records")
+        window.resizable(False, False)
+        label_style = dict(bg=self.action_panel_bg, fg=self.text_color, font=self.button_font)
+
+        #One row per field with inclusive From/To boxes (blank = no limit)
+        tk.Label(window, text="From", **label_style).grid(row=0, column=1)
+        tk.Label(window, text="To", **label_style).grid(row=0, column=2)
+        self.filter_entries = {}
+        for row, (field, label) in enumerate(FILTER_FIELDS, start=1):
+            tk.Label(window, text=label, anchor=tk.W, **label_style).grid(row=row, column=0, sticky="w", padx=(0, 10), pady=3)
+            entries = (tk.Entry(window, width=8, font=self.body_font), tk.Entry(window, width=8, font=self.body_font))
+            entries[0].grid(row=row, column=1, padx=3)
+            entries[1].grid(row=row, column=2, padx=3)
+            self.filter_entries[field] = entries
+
+        #Grade checkboxes (none ticked = any grade)
+        grade_frame = tk.Frame(window, bg=self.action_panel_bg)
+        grade_frame.grid(row=len(FILTER_FIELDS) + 1, column=0, columnspan=3, sticky="w", pady=(10, 5))
+        tk.Label(grade_frame, text="Grades:", **label_style).pack(side=tk.LEFT)
+        self.filter_grades = {}
+        for grade, _ in GRADE_BOUNDARIES:
+            var = self.filter_grades[grade] = tk.BooleanVar(value=False)
+            tk.Checkbutton(grade_frame, text=grade, variable=var, selectcolor=self.primary_bg,
+                           activebackground=self.action_panel_bg, activeforeground=self.accent_color,
+                           **label_style).pack(side=tk.LEFT)
+
+        button_frame = tk.Frame(window, bg=self.action_panel_bg)
+        button_frame.grid(row=len(FILTER_FIELDS) + 2, column=0, columnspan=3, sticky="we", pady=(10, 0))
+        for text, command, color in (("Apply", self.apply_filter, self.view_button_color),
+                                     ("Clear", self.clear_filter, self.modify_button_color)):
+            tk.Button(button_frame, text=text, command=command, font=self.button_font, bg=color,
+                      fg=self.primary_bg, relief=tk.FLAT, bd=0, padx=10, pady=5).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=3)
+        window.bind('<Return>', lambda event: self.apply_filter())
+
+    def clear_filter(self):
+        for entries in self.filter_entries.values():
+            for entry in entries: entry.delete(0, tk.END)
+        for var in self.filter_grades.values(): var.set(False)
+
+    def apply_filter(self):
+        """Builds a StudentQuery from the panel and shows the matches, best first."""
+        query = StudentQuery()
+        try:
+            for field, (low_entry, high_entry) in self.filter_entries.items():
+                convert = float if field == "percentage" else int
+                low, high = low_entry.get().strip(), high_entry.get().strip()
+                if low: query.where(field, ">=", convert(low))
+                if high: query.where(field, "<=", convert(high))
+        except ValueError:
+            messagebox.showwarning("Warning", "Filter limits must be numbers (whole numbers for marks).",
+                                   parent=self.filter_window)
+            return
+        grades = [grade for grade, var in self.filter_grades.items() if var.get()]
+        if grades:
+            query.with_grades(grades)
+
+        start = time.perf_counter()
+        found = self.repo.filter(query)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self._clear_output(f"Filtered Records: {query.describe()}")
+        self.output_area.config(state=tk.NORMAL)
+        if found:
+            self.output_area.insert(tk.END, f"--- {len(found)} Match(es) Found ---\n\n", "match_header")
+            self.output_area.tag_config("match_header", font=self.header_font, foreground=self.accent_color)
+            self._show_records(reversed(found))
+        else:
+            self.output_area.insert(tk.END, "No student matches this filter.", "error_message")
+            self.output_area.tag_config("error_message", foreground=self.highlight_color, font=self.body_font)
+        self.output_area.config(state=tk.DISABLED)
+        self.status_bar.config(text=f"Status: {len(found)} record(s) match {query.describe()} ({elapsed:.1f} ms).")
+
+    #Per-component analytics
+    def show_analytics(self):
+        if not self.repo.count():
+            messagebox.showinfo("Info", "No student data available to analyse.")
+            return
+
+        #Recomputed only when marks have changed since the last view (name edits keep the cache)
+        cached = self.analytics_version == self.repo.marks_version
+        if not cached:
+            self.analytics = CohortAnalytics(*self.repo.mark_columns())
+            self.analytics_version = self.repo.marks_version
+
+        self._clear_output("Cohort Analytics")
+        self.output_area.config(state=tk.NORMAL)
+        self.output_area.insert(tk.END, self.analytics.format_report())
+        self.output_area.config(state=tk.DISABLED)
+        self.status_bar.config(text=f"Status: Displayed analytics for {self.analytics.count} students"
+                                    f"{' (cached)' if cached else ''}.")
+
+    #What-if grading
+    def _refresh_histogram(self):
+        """Rebuilds the (coursework, exam) histogram if marks changed since it was built."""
+        if self.histogram_version != self.repo.marks_version:
+            self.grade_histogram = CohortHistogram.from_columns(*self.repo.mark_columns())
+            self.standard_counts = self.grade_histogram.regrade(STANDARD)
+            self.histogram_version = self.repo.marks_version
+            if self.chart is not None:
+                self._build_chart() #The chart reads the histogram it was given, so rebuild it
+
+    def _on_marks_changed(self, old, new):
+        """Repository listener: applies one student's change to the histogram and the open views."""
+        if self.grade_histogram is None or self.histogram_version != self.repo.marks_version - 1:
+            return #No histogram yet (or it is stale); rebuilt from the columns when next needed
+        if old is None and new is None: #Reloaded
+            self._refresh_histogram()
+            return
+        if old is not None: self.grade_histogram.remove(*old)
+        if new is not None: self.grade_histogram.add(*new)
+        self.standard_counts = self.grade_histogram.regrade(STANDARD)
+        self.histogram_version = self.repo.marks_version
+        if self.chart is not None:
+            self.chart.update(old and sum(old), new and sum(new))
+        if self.what_if_window is not None and self.what_if_window.winfo_exists():
+            self._regrade()
+
+    def show_what_if(self):
+        if not self.repo.count():
+            messagebox.showinfo("Info", "No student data available to re-grade.")
+            return
+        if self.what_if_window is not None and self.what_if_window.winfo_exists():
+            self.what_if_window.lift()
+            return
+
+        window = self.what_if_window = tk.Toplevel(self.master, bg=self.action_panel_bg, padx=15, pady=15)
+        window.title("What-if Grading")
+        window.resizable(False, False)
+        label_style = dict(bg=self.action_panel_bg, fg=self.text_color, font=self.button_font)
+        scale_style = dict(orient=tk.HORIZONTAL, length=320, command=self._regrade, bg=self.action_panel_bg,
+                           fg=self.text_color, troughcolor=self.primary_bg, highlightthickness=0, font=self.body_font)
+
+        #Scheme presets and saved schemes
+        self.schemes = {scheme.name: scheme for scheme in load_schemes()}
+        self.scheme_name = tk.StringVar(value=STANDARD.name)
+        tk.Label(window, text="Scheme:", **label_style).grid(row=0, column=0, sticky="w")
+        self.scheme_menu = tk.OptionMenu(window, self.scheme_name, *self.schemes, command=self._load_scheme)
+        self.scheme_menu.config(font=self.body_font, bg=self.view_button_color, relief=tk.FLAT, highlightthickness=0)
+        self.scheme_menu.grid(row=0, column=1, sticky="we", pady=(0, 10))
+
+        #Coursework weight and one lower boundary per grade (the last grade takes the rest)
+        self.weight_scale = tk.Scale(window, label="Coursework weight (%)", from_=0, to=100, resolution=0.5, **scale_style)
+        self.weight_scale.grid(row=1, column=0, columnspan=2)
+        self.boundary_scales = {}
+        for row, (grade, _) in enumerate(STANDARD.boundaries[:-1], start=2):
+            scale = self.boundary_scales[grade] = tk.Scale(window, label=f"Grade {grade} from (%)", from_=0, to=100,
+                                                           resolution=1, **scale_style)
+            scale.grid(row=row, column=0, columnspan=2)
+
+        #Re-graded counts per grade, against the standard scheme
+        row = len(STANDARD.boundaries) + 1
+        self.what_if_labels = {}
+        for grade, _ in STANDARD.boundaries:
+            label = self.what_if_labels[grade] = tk.Label(window, anchor=tk.W, bg=self.action_panel_bg,
+                                                          fg=self.text_color, font=self.body_font)
+            label.grid(row=row, column=0, columnspan=2, sticky="w")
+            row += 1
+        self.what_if_summary = tk.Label(window, anchor=tk.W, justify=tk.LEFT, bg=self.action_panel_bg,
+                                        fg=self.accent_color, font=self.body_font)
+        self.what_if_summary.grid(row=row, column=0, columnspan=2, sticky="w", pady=(5, 10))
+
+        button_frame = tk.Frame(window, bg=self.action_panel_bg)
+        button_frame.grid(row=row + 1, column=0, columnspan=2, sticky="we")
+        for text, command, color in (("Reset", lambda: self._load_scheme(self.scheme_name.get()), self.view_button_color),
+                                     ("Save Scheme", self._save_what_if_scheme, self.modify_button_color)):
+            tk.Button(button_frame, text=text, command=command, font=self.button_font, bg=color,
+                      fg=self.primary_bg, relief=tk.FLAT, bd=0, padx=10, pady=5).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=3)
+
+        self._load_scheme(STANDARD.name)
+
+    def _load_scheme(self, name):
+        scheme = self.schemes[name]
+        self.weight_scale.set(scheme.coursework_weight)
+        for grade, minimum in scheme.boundaries:
+            if grade in self.boundary_scales: self.boundary_scales[grade].set(minimum)
+        self._regrade()
+
+    def _current_scheme(self):
+        boundaries = [(grade, scale.get()) for grade, scale in self.boundary_scales.items()]
+        boundaries.append((STANDARD.boundaries[-1][0], 0))
+        return GradingScheme(self.scheme_name.get(), boundaries, self.weight_scale.get())
+
+    def _regrade(self, *_):
+        """Slider callback: re-grades the whole cohort from the histogram (no pass over the students)."""
+        self._refresh_histogram()
+        scheme = self._current_scheme()
+        start = time.perf_counter()
+        counts = self.grade_histogram.regrade(scheme)
+        changed = self.grade_histogram.changed(scheme)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        size = len(self.grade_histogram) or 1
+        for grade, label in self.what_if_labels.items():
+            count, standard = counts.get(grade, 0), self.standard_counts.get(grade, 0)
+            label.config(text=f"  {grade}: {count:>7} ({100 * count / size:5.1f}%)   standard {standard:>7} "
+                              f"({count - standard:+d})")
+        self.what_if_summary.config(text=f"{changed} student(s) change grade vs Standard\n"
+                                         f"Re-graded {len(self.grade_histogram)} students in {elapsed:.2f} ms")
+
+    def _save_what_if_scheme(self):
+        name = simpledialog.askstring("Save Scheme", "Name for this grading scheme:", parent=self.what_if_window)
+        if name is None or not name.strip():
+            return
+        scheme = self._current_scheme().with_changes(name=name.strip())
+        try:
+            save_scheme(scheme)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Failed to save scheme: {e}", parent=self.what_if_window)
+            return
+        self.schemes[scheme.name] = scheme
+        menu = self.scheme_menu["menu"]
+        menu.delete(0, tk.END)
+        for scheme_name in self.schemes:
+            menu.add_command(label=scheme_name, command=tk._setit(self.scheme_name, scheme_name, self._load_scheme))
+        self.scheme_name.set(scheme.name)
+        self.status_bar.config(text=f"Status: Saved grading scheme '{scheme.name}'.")
+
+    #Grade distribution chart
+    def show_grade_chart(self):
+        if not self.repo.count():
+            messagebox.showinfo("Info", "No student data available to chart.")
+            return
+        if self.chart_window is not None and self.chart_window.winfo_exists():
+            self.chart_window.lift()
+            return
+
+        window = self.chart_window = tk.Toplevel(self.master, bg=self.primary_bg)
+        window.title("Grade Distribution")
+        window.geometry("760x440")
+        self.chart_canvas = tk.Canvas(window, bg=self.primary_bg, highlightthickness=0)
+        self.chart_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        window.protocol("WM_DELETE_WINDOW", self._close_chart)
+        window.update_idletasks() #Real canvas size for the first layout
+        self._refresh_histogram()
+        self._build_chart()
+        self.chart_canvas.bind("<Configure>", lambda event: self.chart.layout())
+        self.status_bar.config(text="Status: Displayed grade distribution chart.")
+
+    def _build_chart(self):
+        self.chart_canvas.delete("all")
+        self.chart = GradeChart(self.chart_canvas, self.grade_histogram.totals, self.text_color, ("Fira Code", 9))
+
+    def _close_chart(self):
+        self.chart = None
+        self.chart_window.destroy()
+
     #Add a student record
     def add_student_record(self):
         #Helper for input validation and conversion to int
@@ -522,7 +734,7 @@ class StudentManagerApp:
             s_num = s_num.strip()
             
             #Check for duplicates
-            if any(s.student_number == s_num for s in self.students):
+            if self.repo.exists(s_num):
                 messagebox.showwarning("Warning", "Student Number already exists. Please enter a unique number.")
             else:
                 break
@@ -546,27 +758,22 @@ class StudentManagerApp:
 
         #Create and add new student
         new_student = Student(s_num, name, c1, c2, c3, exam)
-        self.students.append(new_student)
-        self.num_students = len(self.students) # Update the count
 
-        #Save and display result
-        if self.save_student_data():
+        #Save and display result (the repository undoes the add if it cannot be saved)
+        if self._commit(self.repo.add, new_student):
             self._clear_output("Student Record Added")
             self.output_area.config(state=tk.NORMAL)
             self.output_area.insert(tk.END, f"Successfully added new student record:\n\n")
-            self.output_area.insert(tk.END, new_student.get_formatted_record())
+            self.output_area.insert(tk.END, self._format_record(new_student))
             self.output_area.config(state=tk.DISABLED)
             self.status_bar.config(text=f"Status: Added student '{name}'. Data saved.")
         else:
-            #If save fails, remove the student to maintain consistency
-            self.students.remove(new_student) 
-            self.num_students = len(self.students)
             self.status_bar.config(text="Status: Add failed (Save error).")
 
 
     #Delete a student record
     def delete_student_record(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data to delete.")
             return
 
@@ -602,25 +809,20 @@ class StudentManagerApp:
                                            parent=self.master)
 
         if confirmation:
-            self.students.remove(student_to_delete)
-            self.num_students = len(self.students)
-
-            if self.save_student_data():
+            if self._commit(self.repo.delete, student_to_delete):
                 self._clear_output("Student Record Deleted")
                 self.output_area.config(state=tk.NORMAL)
                 self.output_area.insert(tk.END, f"Successfully deleted record for: {student_to_delete.name} (Num: {student_to_delete.student_number})")
                 self.output_area.config(state=tk.DISABLED)
                 self.status_bar.config(text=f"Status: Deleted student '{student_to_delete.name}'. Data saved.")
             else:
-                #Critical Error: Data deletion was successful in memory but failed to save. 
-                #Reverting the deletion is complex, so we just inform the user and leave the list in memory.
-                messagebox.showerror("Critical Error", "Failed to save deletion to file. Data in memory may not match file.")
+                #The repository keeps the record when the deletion cannot be saved
                 self.status_bar.config(text="Status: Delete failed (Save error).")
 
 
     #Update a student's record
     def update_student_record(self):
-        if not self.students:
+        if not self.repo.count():
             messagebox.showinfo("Info", "No student data to update.")
             return
 
@@ -680,44 +882,39 @@ class StudentManagerApp:
                                                 "E: Exam Mark",
                                                 parent=self.master).strip().upper()
 
-        updated = False
+        changes = {} #Field -> new value, written as a single-row update
         
         if update_choice == 'N':
             new_name = simpledialog.askstring("Update Name", f"Enter new name for {student_to_update.name}:", parent=self.master)
             if new_name and new_name.strip():
-                student_to_update.name = new_name.strip()
-                updated = True
+                changes['name'] = new_name.strip()
         elif update_choice == 'C1':
             new_c1 = get_mark_update("Enter new Course 1 Mark", student_to_update.course1, 20)
             if new_c1 is not None:
-                student_to_update.course1 = new_c1
-                updated = True
+                changes['course1'] = new_c1
         elif update_choice == 'C2':
             new_c2 = get_mark_update("Enter new Course 2 Mark", student_to_update.course2, 20)
             if new_c2 is not None:
-                student_to_update.course2 = new_c2
-                updated = True
+                changes['course2'] = new_c2
         elif update_choice == 'C3':
             new_c3 = get_mark_update("Enter new Course 3 Mark", student_to_update.course3, 20)
             if new_c3 is not None:
-                student_to_update.course3 = new_c3
-                updated = True
+                changes['course3'] = new_c3
         elif update_choice == 'E':
             new_exam = get_mark_update("Enter new Exam Mark", student_to_update.exam_mark, 100)
             if new_exam is not None:
-                student_to_update.exam_mark = new_exam
-                updated = True
+                changes['exam_mark'] = new_exam
         else:
             messagebox.showwarning("Warning", "Invalid update choice.")
             self.status_bar.config(text="Status: Update failed (Invalid choice).")
             return
             
-        if updated:
-            if self.save_student_data():
+        if changes:
+            if self._commit(self.repo.update, student_to_update, **changes):
                 self._clear_output("Student Record Updated")
                 self.output_area.config(state=tk.NORMAL)
                 self.output_area.insert(tk.END, f"Successfully updated record for: {student_to_update.name}\n\n")
-                self.output_area.insert(tk.END, student_to_update.get_formatted_record())
+                self.output_area.insert(tk.END, self._format_record(student_to_update))
                 self.output_area.config(state=tk.DISABLED)
                 self.status_bar.config(text=f"Status: Updated student '{student_to_update.name}'. Data saved.")
             else:
@@ -728,13 +925,18 @@ class StudentManagerApp:
 
 #Main execution block
 if __name__ == '__main__':
+    #python StudentMarksExtension.py [--file marks.txt.gz] [--db students.db]
+    #   --file  marks file to use (.gz/.xz/.bz2 are read and saved compressed)
+    #   --db    SQLite backend instead of the text file (seeded from the marks file on first run)
+    args = sys.argv[1:]
+    filename, repository = STUDENTS_FILE, None
+    if '--file' in args:
+        i = args.index('--file'); filename = args[i + 1]; del args[i:i + 2]
+    if len(args) == 2 and args[0] == '--db':
+        repository = SQLiteRepository(args[1])
+        if repository.count() == 0:
+            try: repository.import_text(filename) #First run: seed the database from the text file
+            except (OSError, ValueError) as e: print(f"Could not import '{filename}': {e}")
     root = tk.Tk()
-    app = StudentManagerApp(root)
+    app = StudentManagerApp(root, repository, filename)
     root.mainloop()
-
-    #Quit pygame mixer after Tkinter window closes
-    if pygame_available:
-        try:
-            pygame.quit()
-        except Exception:
-            pass #Ignore if mixer wasn't initialized
\ No newline at end of file
@@ -0,0 +1,196 @@
+#Filter queries over student marks: "between 40% and 50%", "all Fs", "exam < 40 and coursework > 45".
+#A StudentQuery turns percentage, total and grade conditions into a test on the overall total, and
+#exam/coursework conditions into an exam-mark interval for each total (coursework = total - exam).
+#MarksIndex keeps students bucketed by total and sorted by exam mark inside each bucket, so a query
+#costs two bisects per matching total plus list slices, whatever the size of the cohort.
+#Usage: python StudentQuery.py benchmark [rows]
+import math
+import operator
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from StudentRepository import GRADE_BOUNDARIES, percentage_of, grade_for
+
+#Condition operators; 'between' is stored as a >= and a <= condition
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+#Queryable fields -> Student value and SQLite expression
+FIELDS = {
+    "percentage": (lambda s: s.get_percentage(), "percentage"),
+    "total": (lambda s: s.get_overall_total(), "total"),
+    "exam": (lambda s: s.exam_mark, "exam_mark"),
+    "coursework": (lambda s: s.get_coursework_total(), "(course1 + course2 + course3)"),
+    "course1": (lambda s: s.course1, "course1"),
+    "course2": (lambda s: s.course2, "course2"),
+    "course3": (lambda s: s.course3, "course3"),
+}
+TOTAL_FIELDS = ("percentage", "total") #Decided by the overall total alone
+RESIDUAL_FIELDS = ("course1", "course2", "course3") #Checked record by record on the candidates
+
+
+class StudentQuery:
+    """A conjunction of conditions on marks plus an optional set of grades. Empty matches everyone."""
+    def __init__(self):
+        self.conditions = [] #(field, op, value)
+        self.grades = None #Set of grade letters, or None for any grade
+
+    def where(self, field, op, value, high=None):
+        """Adds 'field op value' (or 'field between value and high'). Returns self for chaining."""
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        if op == "between":
+            return self.where(field, ">=", value).where(field, "<=", high)
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        self.conditions.append((field, op, value))
+        return self
+
+    def with_grades(self, grades):
+        """Restricts the query to the given grade letters. Returns self."""
+        grades = {g.upper() for g in grades}
+        unknown = grades - {g for g, _ in GRADE_BOUNDARIES}
+        if unknown:
+            raise ValueError(f"Unknown grade(s): {', '.join(sorted(unknown))}")
+        self.grades = grades
+        return self
+
+    def is_empty(self):
+        return not self.conditions and self.grades is None
+
+    def describe(self):
+        parts = [f"{field} {op} {value:g}" for field, op, value in self.conditions]
+        if self.grades is not None:
+            parts.append(f"grade in {', '.join(sorted(self.grades)) or '(none)'}")
+        return " and ".join(parts) or "all students"
+
+    def matches(self, student):
+        """Direct test of one record (reference behaviour for the index and SQL paths)."""
+        if self.grades is not None and student.get_grade() not in self.grades:
+            return False
+        return all(OPERATORS[op](FIELDS[field][0](student), value) for field, op, value in self.conditions)
+
+    #Index path
+    def accepts_total(self, total):
+        """True if a student with this overall total can pass the percentage/total/grade conditions."""
+        percent = percentage_of(total)
+        if self.grades is not None and grade_for(percent) not in self.grades:
+            return False
+        for field, op, value in self.conditions:
+            if field in TOTAL_FIELDS and not OPERATORS[op](percent if field == "percentage" else total, value):
+                return False
+        return True
+
+    def exam_bounds(self, total):
+        """Inclusive (low, high) exam-mark interval allowed for this total; None means open."""
+        low, high = None, None
+        for field, op, value in self.conditions:
+            if field not in ("exam", "coursework"): continue
+            if op in ("<", "<="):
+                bound = math.ceil(value) - 1 if op == "<" else math.floor(value)
+            elif op in (">", ">="):
+                bound = math.floor(value) + 1 if op == ">" else math.ceil(value)
+            else:
+                if value != int(value): return 1, 0 #Whole-number field can never equal it
+                bound = int(value)
+            if field == "coursework": #coursework <= x  <=>  exam >= total - x, and so on
+                bound = total - bound
+                op = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "=="}[op]
+            if op in ("<", "<=", "=="):
+                high = bound if high is None else min(high, bound)
+            if op in (">", ">=", "=="):
+                low = bound if low is None else max(low, bound)
+        return low, high
+
+    def residual(self):
+        """Record-by-record test for the conditions the index cannot answer, or None."""
+        checks = [(FIELDS[field][0], OPERATORS[op], value)
+                  for field, op, value in self.conditions if field in RESIDUAL_FIELDS]
+        if not checks: return None
+        return lambda s: all(test(get(s), value) for get, test, value in checks)
+
+    #SQLite path
+    def to_sql(self):
+        """(WHERE clause without the keyword, parameters); the percentage index serves range queries."""
+        clauses, params = [], []
+        for field, op, value in self.conditions:
+            clauses.append(f"{FIELDS[field][1]} {'=' if op == '==' else op} ?")
+            params.append(value)
+        if self.grades is not None:
+            ranges, upper = [], None
+            for grade, minimum in GRADE_BOUNDARIES:
+                is_lowest = grade == GRADE_BOUNDARIES[-1][0]
+                if grade in self.grades:
+                    bounds = [] if is_lowest else ["percentage >= ?"]
+                    values = [] if is_lowest else [minimum]
+                    if upper is not None: bounds.append("percentage < ?"); values.append(upper)
+                    ranges.append(" AND ".join(bounds) or "1"); params.extend(values)
+                upper = minimum
+            clauses.append("(" + (" OR ".join(f"({r})" for r in ranges) or "0") + ")")
+        return " AND ".join(clauses) or "1", params
+
+
+class MarksIndex:
+    """Students grouped by overall total; each group is sorted by exam mark (ties in load order)."""
+    def __init__(self, students=()):
+        self.buckets = {} #total -> (exam marks, students), both in exam order
+        for student in sorted(students, key=lambda s: s.exam_mark):
+            self.add(student) #Already in exam order, so every insert is an append
+
+    def add(self, student):
+        exams, members = self.buckets.setdefault(student.get_overall_total(), ([], []))
+        i = bisect_right(exams, student.exam_mark)
+        exams.insert(i, student.exam_mark); members.insert(i, student)
+
+    def remove(self, student, total=None, exam=None):
+        """Removes the student, filed under its old total and exam mark if they have just changed."""
+        total = student.get_overall_total() if total is None else total
+        exam = student.exam_mark if exam is None else exam
+        exams, members = self.buckets[total]
+        for i in range(bisect_left(exams, exam), bisect_right(exams, exam)):
+            if members[i] is student:
+                del exams[i], members[i]
+                break
+        if not exams: del self.buckets[total]
+
+    def search(self, query):
+        """Matching students in ascending order of total, then exam mark."""
+        residual = query.residual()
+        results = []
+        for total in sorted(self.buckets):
+            if not query.accepts_total(total): continue
+            exams, members = self.buckets[total]
+            low, high = query.exam_bounds(total)
+            start = 0 if low is None else bisect_left(exams, low)
+            end = len(exams) if high is None else bisect_right(exams, high)
+            if start >= end: continue
+            chunk = members[start:end]
+            results.extend(filter(residual, chunk) if residual else chunk)
+        return results
+
+
+def benchmark(rows=1_000_000):
+    import contextlib, io, os, tempfile
+    from ParallelLoader import load_columns, write_sample
+    path = os.path.join(tempfile.gettempdir(), f"marks_query_{rows}.txt")
+    if not os.path.exists(path): write_sample(path, rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        students = load_columns(path, 1)[0].students()
+    start = time.perf_counter(); index = MarksIndex(students); built = time.perf_counter() - start
+    print(f"{len(students)} students, index built in {built:.2f} s")
+    queries = [
+        ("40% to 50%", StudentQuery().where("percentage", "between", 40, 50)),
+        ("grade F", StudentQuery().with_grades("F")),
+        ("exam < 40 and coursework > 45", StudentQuery().where("exam", "<", 40).where("coursework", ">", 45)),
+        ("grade A and course1 == 20", StudentQuery().with_grades("A").where("course1", "==", 20)),
+    ]
+    for label, query in queries:
+        start = time.perf_counter(); found = index.search(query); indexed = time.perf_counter() - start
+        start = time.perf_counter(); scanned = [s for s in students if query.matches(s)]; scan = time.perf_counter() - start
+        same = sorted(map(id, found)) == sorted(map(id, scanned))
+        print(f"{label:>32}: {len(found):>7} matches  index {indexed * 1000:7.1f} ms  "
+              f"full scan {scan * 1000:7.1f} ms  {'identical' if same else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["benchmark"]:
+        print("Usage: python StudentQuery.py benchmark [rows]"); sys.exit(1)
+    benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
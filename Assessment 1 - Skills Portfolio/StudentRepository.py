@@ -0,0 +1,416 @@
+#Student records and the two storage backends used by StudentMarksExtension.
+#TextFileRepository keeps the list in memory and rewrites studentMarks.txt after each edit;
+#SQLiteRepository stores one row per student with indexes, so searches, sorting,
+#highest/lowest and the summary run as SQL queries and each edit is a one-row transaction.
+#Usage:
+#   python StudentRepository.py import studentMarks.txt [--db students.db]
+#   python StudentRepository.py export studentMarks.txt [--db students.db]
+import os
+import sqlite3
+import sys
+from RankIndex import TotalsIndex, MAX_TOTAL
+from MarksCodecs import is_compressed, open_marks
+
+STUDENTS_FILE = "studentMarks.txt"
+STUDENTS_DB = "students.db"
+PARALLEL_LOAD_BYTES = 8 * 1024 * 1024 #Files at least this big are parsed by ParallelLoader
+#Grade letters and the minimum percentage for each, best first
+GRADE_BOUNDARIES = (('A', 70), ('B', 60), ('C', 50), ('D', 40), ('F', 0))
+
+
+def percentage_of(total):
+    """Overall percentage for a total out of 160 (same arithmetic as the SQLite column)."""
+    return total * 100 / MAX_TOTAL
+
+
+def grade_for(percent):
+    """Grade letter for a percentage, from GRADE_BOUNDARIES."""
+    for grade, minimum in GRADE_BOUNDARIES:
+        if percent >= minimum:
+            return grade
+    return GRADE_BOUNDARIES[-1][0]
+
+
+#Data Structure for Student Records
+class Student:
+    """Represents a single student's record and calculated results."""
+    def __init__(self, student_number, name, course1, course2, course3, exam_mark):
+        self.student_number = str(student_number)
+        self.name = name
+        #Coursework marks (C1, C2, C3) and Exam mark are stored here.
+        self.course1 = int(course1)
+        self.course2 = int(course2)
+        self.course3 = int(course3)
+        self.exam_mark = int(exam_mark)
+
+    def get_coursework_total(self):
+        """Calculates the total coursework mark (max 60)."""
+        return self.course1 + self.course2 + self.course3
+
+    def get_overall_total(self):
+        """Calculates the overall total mark (max 160 = 60 CW + 100 Exam)."""
+        return self.get_coursework_total() + self.exam_mark
+
+    def get_percentage(self):
+        """Calculates the overall percentage based on 160 total marks."""
+        return percentage_of(self.get_overall_total())
+
+    def get_grade(self):
+        """Determines the student's grade based on percentage (as per specs)."""
+        return grade_for(self.get_percentage())
+
+    def get_formatted_record(self, rank=None):
+        """Returns a string with the full formatted record for display.
+        'rank' is an optional (position, class size, percentile) from the repository."""
+        rank_line = f"  Class Rank: {rank[0]} / {rank[1]} (percentile {rank[2]:.1f})\n" if rank else ""
+        return (
+            f"  Name: {self.name}\n"
+            f"  Number: {self.student_number}\n"
+            f"  Total Coursework: {self.get_coursework_total():<3} / 60\n"
+            f"  Exam Mark: {self.exam_mark:<3} / 100\n"
+            f"  Overall Percentage: {self.get_percentage():<6.2f}%\n"
+            f"  Student Grade: {self.get_grade()}\n"
+            f"{rank_line}"
+            f"{'=' * 35}"
+        )
+        
+    def to_file_format(self):
+        """Returns the record in the comma-separated format used in the file."""
+        return f"{self.student_number}, {self.name}, {self.course1}, {self.course2}, {self.course3}, {self.exam_mark}"
+
+    def to_row(self):
+        return (self.student_number, self.name, self.name.lower(),
+                self.course1, self.course2, self.course3, self.exam_mark)
+
+
+#Text file format: a count line, then 'number, name, c1, c2, c3, exam' per student
+def read_student_file(filename=STUDENTS_FILE, parallel=True):
+    """Parses the text file. Returns (students, expected count); raises OSError or ValueError.
+    .gz/.xz/.bz2 files are decompressed and parsed as a stream."""
+    if is_compressed(filename):
+        from ParallelLoader import load_columns_stream
+        columns, num_students = load_columns_stream(filename)
+        return columns.students(), num_students
+    if parallel and os.path.getsize(filename) >= PARALLEL_LOAD_BYTES:
+        #Large exports are split into byte ranges and parsed on every core
+        from ParallelLoader import read_student_file_parallel
+        return read_student_file_parallel(filename)
+    student_list = []
+    with open(filename, 'r') as file:
+        lines = file.readlines()
+    if not lines:
+        raise ValueError("File is empty.")
+    #The first line is expected to be the total number of students
+    num_students = int(lines[0].strip())
+    for line in lines[1:]:
+        parts = [p.strip() for p in line.split(',')]
+        if len(parts) == 6:
+            try:
+                # Convert marks to integers
+                student_list.append(Student(parts[0], parts[1], int(parts[2]), int(parts[3]),
+                                            int(parts[4]), int(parts[5])))
+            except ValueError:
+                print(f"Skipping line due to invalid mark data: {line.strip()}")
+        else:
+            print(f"Skipping line due to incorrect format: {line.strip()}")
+    return student_list, num_students
+
+
+def write_student_file(filename, students, level=None):
+    """Writes the count line and one comma-separated record per student (compressed for
+    .gz/.xz/.bz2 names, at the codec's default level unless 'level' is given)."""
+    with open_marks(filename, 'w', level=level) as file:
+        file.write(f"{len(students)}\n")
+        for student in students:
+            file.write(f"{student.to_file_format()}\n")
+
+
+#Sort choices offered by the app: key -> (title, Python sort key, SQL column)
+SORT_KEYS = {
+    'N': ("Alphabetical Order by Name", lambda s: s.name.lower(), "name_lower"),
+    'T': ("Overall Total Score", lambda s: s.get_overall_total(), "percentage"), #Same order, uses its index
+    'P': ("Overall Percentage", lambda s: s.get_percentage(), "percentage"),
+}
+EDITABLE_FIELDS = ("name", "course1", "course2", "course3", "exam_mark")
+MARK_FIELDS = EDITABLE_FIELDS[1:]
+
+
+def marks_key(student):
+    """(coursework, exam): all that grading, ranking and the charts need from a record."""
+    return student.get_coursework_total(), student.exam_mark
+
+
+class TextFileRepository:
+    """Students kept in a list and written back to the text file after every edit."""
+    def __init__(self, students=None, filename=STUDENTS_FILE):
+        self.filename = filename
+        self.students = students if students is not None else []
+        self.ranks = TotalsIndex(s.get_overall_total() for s in self.students)
+        self.index = None #MarksIndex for filter queries, built on first use
+        self.marks_version = 0 #Bumped whenever a mark is added, changed or removed
+        self.listeners = [] #Called as listener(old, new) after each mark change, see _marks_changed
+
+    def count(self): return len(self.students)
+
+    def all(self): return list(self.students)
+
+    def exists(self, student_number):
+        return any(s.student_number == student_number for s in self.students)
+
+    def find(self, search_term):
+        """Exact student number match (case-insensitive) first, else name prefix matches by name."""
+        for student in self.students:
+            if student.student_number.lower() == search_term:
+                return [student]
+        found_students = [s for s in self.students if s.name.lower().startswith(search_term)]
+        #Sort matches alphabetically by name if multiple results exist
+        if len(found_students) > 1:
+            found_students.sort(key=lambda s: s.name.lower())
+        return found_students
+
+    def ordered(self, key, reverse=False):
+        """Sorts the stored order (as the text app always has) and returns it."""
+        self.students.sort(key=SORT_KEYS[key][1], reverse=reverse)
+        return list(self.students)
+
+    def highest(self):
+        return max(self.students, key=lambda s: s.get_overall_total(), default=None)
+
+    def lowest(self):
+        return min(self.students, key=lambda s: s.get_overall_total(), default=None)
+
+    def average_percentage(self):
+        return sum(s.get_percentage() for s in self.students) / len(self.students) if self.students else 0.0
+
+    def rank_of(self, student):
+        total = student.get_overall_total()
+        return self.ranks.rank(total), len(self.ranks), self.ranks.percentile(total)
+
+    def count_above(self, total):
+        return self.ranks.count_above(total)
+
+    def mark_columns(self):
+        """(course1, course2, course3, exam) lists in storage order."""
+        return ([s.course1 for s in self.students], [s.course2 for s in self.students],
+                [s.course3 for s in self.students], [s.exam_mark for s in self.students])
+
+    def filter(self, query):
+        """Students matching a StudentQuery, lowest percentage first."""
+        if self.index is None:
+            from StudentQuery import MarksIndex #Imported here: StudentQuery imports this module
+            self.index = MarksIndex(self.students)
+        return self.index.search(query)
+
+    def _marks_changed(self, old, new):
+        """Bumps marks_version and tells the listeners. old/new are marks_key() tuples, None for an
+        add or delete; both None means everything may have changed (reloaded)."""
+        self.marks_version += 1
+        for listener in self.listeners:
+            listener(old, new)
+
+    def save(self):
+        write_student_file(self.filename, self.students)
+
+    #Edits are applied in memory, saved, and rolled back if the save fails
+    def add(self, student):
+        self.students.append(student)
+        try: self.save()
+        except OSError:
+            self.students.remove(student); raise
+        self.ranks.add(student.get_overall_total())
+        if self.index is not None: self.index.add(student)
+        self._marks_changed(None, marks_key(student))
+
+    def update(self, student, **changes):
+        old = {field: getattr(student, field) for field in changes}
+        old_total, old_exam = student.get_overall_total(), student.exam_mark
+        for field, value in changes.items(): setattr(student, field, value)
+        try: self.save()
+        except OSError:
+            for field, value in old.items(): setattr(student, field, value)
+            raise
+        self.ranks.replace(old_total, student.get_overall_total())
+        if self.index is not None:
+            self.index.remove(student, old_total, old_exam); self.index.add(student)
+        if any(field in MARK_FIELDS for field in changes):
+            self._marks_changed((old_total - old_exam, old_exam), marks_key(student))
+
+    def delete(self, student):
+        index = self.students.index(student)
+        del self.students[index]
+        try: self.save()
+        except OSError:
+            self.students.insert(index, student); raise
+        self.ranks.remove(student.get_overall_total())
+        if self.index is not None: self.index.remove(student)
+        self._marks_changed(marks_key(student), None)
+
+    def export_text(self, filename):
+        write_student_file(filename, self.students)
+
+    def close(self): pass
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id             INTEGER PRIMARY KEY,
+    student_number TEXT    NOT NULL UNIQUE,
+    name           TEXT    NOT NULL,
+    name_lower     TEXT    NOT NULL,
+    course1        INTEGER NOT NULL,
+    course2        INTEGER NOT NULL,
+    course3        INTEGER NOT NULL,
+    exam_mark      INTEGER NOT NULL,
+    total          INTEGER GENERATED ALWAYS AS (course1 + course2 + course3 + exam_mark) STORED,
+    percentage     REAL    GENERATED ALWAYS AS (total * 100.0 / 160) STORED
+);
+CREATE INDEX IF NOT EXISTS students_by_number_nocase ON students (student_number COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS students_by_name ON students (name_lower);
+CREATE INDEX IF NOT EXISTS students_by_percentage ON students (percentage);
+"""
+COLUMNS = "student_number, name, course1, course2, course3, exam_mark"
+INSERT = ("INSERT INTO students (student_number, name, name_lower, course1, course2, course3, exam_mark) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+class SQLiteRepository:
+    """Students stored in a local SQLite file; every query is answered by an index."""
+    def __init__(self, path=STUDENTS_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._build_ranks()
+        self.marks_version = 0 #Bumped whenever a mark is added, changed or removed
+        self.listeners = [] #Called as listener(old, new) after each mark change, see _marks_changed
+
+    def _build_ranks(self):
+        self.ranks = TotalsIndex(total for (total,) in self.conn.execute("SELECT total FROM students"))
+
+    def _select(self, where="", params=(), order="id", limit=None):
+        sql = f"SELECT {COLUMNS} FROM students {where} ORDER BY {order}"
+        if limit: sql += f" LIMIT {int(limit)}"
+        return [Student(*row) for row in self.conn.execute(sql, params)]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def all(self): return self._select()
+
+    def exists(self, student_number):
+        return self.conn.execute("SELECT 1 FROM students WHERE student_number = ?",
+                                 (student_number,)).fetchone() is not None
+
+    def find(self, search_term):
+        found = self._select("WHERE student_number = ? COLLATE NOCASE", (search_term,), limit=1)
+        if found: return found
+        #Prefix search as an index range: name_lower >= term AND name_lower < term + U+10FFFF
+        return self._select("WHERE name_lower >= ? AND name_lower < ?",
+                            (search_term, search_term + "\U0010ffff"), order="name_lower, id")
+
+    def ordered(self, key, reverse=False):
+        return self._select(order=f"{SORT_KEYS[key][2]} {'DESC' if reverse else 'ASC'}, id")
+
+    def highest(self):
+        rows = self._select(order="percentage DESC, id", limit=1)
+        return rows[0] if rows else None
+
+    def lowest(self):
+        rows = self._select(order="percentage ASC, id", limit=1)
+        return rows[0] if rows else None
+
+    def average_percentage(self):
+        return self.conn.execute("SELECT COALESCE(AVG(percentage), 0.0) FROM students").fetchone()[0]
+
+    def rank_of(self, student):
+        total = student.get_overall_total()
+        return self.ranks.rank(total), len(self.ranks), self.ranks.percentile(total)
+
+    def count_above(self, total):
+        return self.ranks.count_above(total)
+
+    def mark_columns(self):
+        """(course1, course2, course3, exam) lists in storage order."""
+        rows = self.conn.execute("SELECT course1, course2, course3, exam_mark FROM students ORDER BY id").fetchall()
+        return tuple(map(list, zip(*rows))) if rows else ([], [], [], [])
+
+    def filter(self, query):
+        """Students matching a StudentQuery, lowest percentage first (range conditions use its index)."""
+        where, params = query.to_sql()
+        return self._select(f"WHERE {where}", params, order="percentage, exam_mark, id")
+
+    def _marks_changed(self, old, new):
+        """Bumps marks_version and tells the listeners. old/new are marks_key() tuples, None for an
+        add or delete; both None means everything may have changed (reloaded)."""
+        self.marks_version += 1
+        for listener in self.listeners:
+            listener(old, new)
+
+    #Each edit is one single-row transaction; sqlite3.Error is raised on failure
+    def add(self, student):
+        with self.conn:
+            self.conn.execute(INSERT, student.to_row())
+        self.ranks.add(student.get_overall_total())
+        self._marks_changed(None, marks_key(student))
+
+    def update(self, student, **changes):
+        for field in changes:
+            if field not in EDITABLE_FIELDS: raise ValueError(f"Unknown field: {field}")
+        columns = dict(changes)
+        if "name" in columns: columns["name_lower"] = columns["name"].lower()
+        assignments = ", ".join(f"{field} = ?" for field in columns)
+        with self.conn:
+            self.conn.execute(f"UPDATE students SET {assignments} WHERE student_number = ?",
+                              (*columns.values(), student.student_number))
+        old_total, old_exam = student.get_overall_total(), student.exam_mark
+        for field, value in changes.items(): setattr(student, field, value)
+        self.ranks.replace(old_total, student.get_overall_total())
+        if any(field in MARK_FIELDS for field in changes):
+            self._marks_changed((old_total - old_exam, old_exam), marks_key(student))
+
+    def delete(self, student):
+        with self.conn:
+            self.conn.execute("DELETE FROM students WHERE student_number = ?", (student.student_number,))
+        self.ranks.remove(student.get_overall_total())
+        self._marks_changed(marks_key(student), None)
+
+    def import_text(self, filename):
+        """Replaces every row with the students in a text file (one transaction). Returns the count."""
+        students, expected = read_student_file(filename)
+        if len(students) != expected:
+            print(f"Warning: Expected {expected} students, but loaded {len(students)}.")
+        with self.conn:
+            self.conn.execute("DELETE FROM students")
+            self.conn.executemany(INSERT, (s.to_row() for s in students))
+        self._build_ranks()
+        self._marks_changed(None, None)
+        return len(students)
+
+    def export_text(self, filename):
+        write_student_file(filename, self.all())
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv):
+    path = STUDENTS_DB
+    if "--db" in argv:
+        i = argv.index("--db"); path = argv[i + 1]; del argv[i:i + 2]
+    if len(argv) != 2 or argv[0] not in ("import", "export"):
+        print("Usage: python StudentRepository.py import|export FILE [--db students.db]")
+        return 1
+    repo = SQLiteRepository(path)
+    try:
+        if argv[0] == "import":
+            print(f"Imported {repo.import_text(argv[1])} students into '{path}'")
+        else:
+            repo.export_text(argv[1])
+            print(f"Exported {repo.count()} students to '{argv[1]}'")
+    finally:
+        repo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,32 @@
+#Regression tests for MarksValidation. Run: python -m pytest test_MarksValidation.py
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from MarksValidation import main, validate_file
+
+
+class HeaderOnlyFileTest(unittest.TestCase):
+    """A '0' header with no records is what the app writes for a new or emptied marks file."""
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w") as f:
+            f.write("0\n")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_validate_file(self):
+        columns, report = validate_file(self.path, workers=1)
+        self.assertEqual(len(columns), 0)
+        self.assertTrue(report.ok, report.summary())
+
+    def test_check_command(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(main(["check", self.path]), 0)
+        self.assertIn("0 records, no problems found.", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()